@@ -1,20 +1,79 @@
-from datetime import datetime
+import logging
+import os
+from asyncio import gather, to_thread
+from datetime import datetime, timedelta
+from typing import Any, Optional
 
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.fsm.storage.base import BaseStorage
 from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.types import User, ChatAdministratorRights, BotDescription, BotShortDescription
 from aiogram.utils.i18n import I18n, SimpleI18nMiddleware
 
-from configs.config import BotSettings, BotEdit, Webhook, Permission
+from configs.config import BotSettings, BotEdit, Webhook, Permission, LogConfig
 from middleware.loggers import log
 
 # Экспортируем объекты модуля
 __all__ = ("dp", "bot", "BotInfo", "i18n",)
 
 
+def _make_storage(redis_url: Optional[str] = BotSettings.REDIS_URL) -> BaseStorage:
+    """
+    Создаёт хранилище FSM: Redis с TTL при заданном REDIS_URL, иначе MemoryStorage.
+
+    :param redis_url: Строка подключения к Redis.
+    :return: Хранилище состояний для диспетчера.
+    """
+    if not redis_url:
+        return MemoryStorage()
+
+    from aiogram.fsm.storage.redis import RedisStorage, DefaultKeyBuilder
+    from redis.asyncio import Redis
+
+    ttl: timedelta = timedelta(seconds=BotSettings.FSM_TTL)
+    return RedisStorage(
+        redis=Redis.from_url(redis_url, decode_responses=False),
+        key_builder=DefaultKeyBuilder(with_bot_id=True, with_destiny=True),
+        state_ttl=ttl,
+        data_ttl=ttl,
+    )
+
+
+class KeepAliveSession(AiohttpSession):
+    """
+    HTTP-сессия Bot API с настраиваемым keep-alive соединений пула.
+
+    Конструктор AiohttpSession не принимает параметры коннектора, поэтому они
+    дописываются в его _connector_init (проверено на aiogram 3.22). Если атрибут
+    исчезнет в новой версии aiogram, сессия упадёт при создании, а не молча потеряет настройку.
+    """
+
+    def __init__(self, keepalive_timeout: float, **kwargs: Any) -> None:
+        """
+        :param keepalive_timeout: Сколько секунд держать простаивающее соединение открытым.
+        :param kwargs: Параметры AiohttpSession (limit, timeout, proxy и т.д.).
+        """
+        self._keepalive_timeout: float = keepalive_timeout
+        super().__init__(**kwargs)
+        self._apply_keepalive()
+
+    def _setup_proxy_connector(self, proxy: Any) -> None:
+        # Смена прокси пересоздаёт параметры коннектора — keep-alive нужно вернуть
+        super()._setup_proxy_connector(proxy)
+        self._apply_keepalive()
+
+    def _apply_keepalive(self) -> None:
+        """Добавляет keepalive_timeout в параметры создаваемого коннектора."""
+        connector_init: Optional[dict[str, Any]] = getattr(self, "_connector_init", None)
+        if connector_init is None:
+            raise RuntimeError("AiohttpSession не содержит _connector_init: проверьте совместимость с версией aiogram")
+        connector_init["keepalive_timeout"] = self._keepalive_timeout
+
+
 # Диспетчер бота, языковых настроек и его хранилища
-storage: MemoryStorage = MemoryStorage()
+storage: BaseStorage = _make_storage()
 dp: Dispatcher = Dispatcher(storage=storage)
 dp["is_active"]: bool = True
 
@@ -25,8 +84,18 @@ i18n_middleware: SimpleI18nMiddleware = SimpleI18nMiddleware(i18n=i18n)
 i18n_middleware.setup(dp)
 
 
+# HTTP-сессия Bot API: увеличенный пул и keep-alive, чтобы параллельные
+# запросы (get_chat_member из фильтров и т.п.) не ждали свободного соединения
+session: AiohttpSession = KeepAliveSession(
+    keepalive_timeout=BotSettings.HTTP_KEEPALIVE,
+    limit=BotSettings.HTTP_POOL_LIMIT,
+    timeout=BotSettings.HTTP_TIMEOUT,
+)
+
+
 # Экземпляр бота с настройками по умолчанию
 bot: Bot = Bot(token=BotSettings.BOT_TOKEN,
+     session=session,
      default=DefaultBotProperties(
         parse_mode=BotSettings.PARSE_MODE,
         disable_notification=BotSettings.DISABLE_NOTIFICATION,
@@ -41,6 +110,55 @@ bot: Bot = Bot(token=BotSettings.BOT_TOKEN,
 )
 
 
+def _file_logger(name: str, filename: str, mode: str) -> logging.Logger:
+    """
+    Создаёт логгер с одним файловым обработчиком, держащим файл открытым.
+
+    :param name: Имя логгера.
+    :param filename: Имя файла в директории логов.
+    :param mode: Режим открытия файла.
+    :return: Настроенный логгер.
+    """
+    logger: logging.Logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if not logger.handlers:
+        # delay=True — файл открывается при первой записи, а не при импорте
+        handler = logging.FileHandler(LogConfig.DIR / filename, mode=mode, encoding="utf-8", delay=True)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+    return logger
+
+
+def _append_line(filename: str, text: str) -> None:
+    """
+    Дописывает строку в файл логов одним системным вызовом write (O_APPEND).
+
+    :param filename: Имя файла в директории логов.
+    :param text: Дописываемый текст.
+    """
+    fd: int = os.open(LogConfig.DIR / filename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, text.encode("utf-8"))
+    finally:
+        os.close(fd)
+
+
+# Директория логов создаётся один раз, чтобы запись не падала на чистом клоне
+LogConfig.DIR.mkdir(parents=True, exist_ok=True)
+
+# Файловый логгер информации о запуске (перезаписывается при каждом старте)
+_info_logger: logging.Logger = _file_logger("bot.info", "info.log", "w")
+
+
+# Поля get_me(), сохраняемые в BotInfo
+_BOT_INFO_FIELDS: frozenset[str] = frozenset({
+    "id", "first_name", "last_name", "username", "language_code", "is_premium",
+    "added_to_attachment_menu", "supports_inline_queries", "can_connect_to_business",
+    "has_main_web_app", "can_join_groups", "can_read_all_group_messages",
+})
+
+
 class BotInfo:
     """Класс для хранения и инициализации данных бота."""
     id: int = None
@@ -51,6 +169,7 @@ class BotInfo:
     description: str = None
     short_description: str = None
     language_code: str = BotSettings.BOT_LANGUAGE
+    is_premium: bool = None
     prefix: str = BotSettings.PREFIX
     bot_owner: str = BotSettings.OWNER
     added_to_attachment_menu: bool = False
@@ -64,22 +183,32 @@ class BotInfo:
     @classmethod
     @log(level='INFO', log_type='BOT', text='Настройка вебхука бота')
     async def webhook(cls, bots: Bot = bot, webhook_url: str = Webhook.WEBHOOK_URL,
-                      use_webhook: bool = Webhook.WEBHOOK) -> None:
+                      use_webhook: bool = Webhook.WEBHOOK,
+                      max_connections: int = Webhook.MAX_CONNECTIONS,
+                      allowed_updates: list[str] | None = None) -> None:
         """
         Удаление или установка вебхука.
 
         :param bots: Объект бота для управления.
         :param use_webhook: Статус использования вебхука, поумолчанию (true).
         :param webhook_url: Ссылка на вебхук.
+        :param max_connections: Количество параллельных соединений Telegram к вебхуку.
+        :param allowed_updates: Типы апдейтов, по умолчанию из конфигов или по подключённым роутерам.
         """
-        # Удаляем текущий вебхук
-        await bots.delete_webhook(drop_pending_updates=True)
+        # Без вебхука — просто удаляем текущий
+        if not use_webhook:
+            await bots.delete_webhook(drop_pending_updates=True)
+            return
 
-        # Если включен вебхук — устанавливаем новый
-        if use_webhook:
-            if webhook_url is None:
-                raise ValueError("Для установки вебхука необходимо указать webhook_url")
-            await bots.set_webhook(webhook_url)
+        # setWebhook сам заменяет предыдущий вебхук, отдельное удаление не нужно
+        if webhook_url is None:
+            raise ValueError("Для установки вебхука необходимо указать webhook_url")
+        await bots.set_webhook(
+            url=webhook_url,
+            max_connections=max_connections,
+            allowed_updates=allowed_updates or Webhook.ALLOWED_UPDATES or dp.resolve_used_update_types(),
+            drop_pending_updates=True,
+        )
 
 
 
@@ -94,53 +223,32 @@ class BotInfo:
         """
         bot_info: User = await bots.get_me()
 
-        cls.id = bot_info.id
-        cls.url = f'tg://user?id={cls.id}'
-        cls.first_name = bot_info.first_name
-        cls.last_name = bot_info.last_name
-        cls.username = bot_info.username
-        cls.description = getattr(bot_info, 'description', '')
-        cls.short_description = getattr(bot_info, 'short_description', '')
-        cls.language_code = bot_info.language_code
-        cls.is_premium = bot_info.is_premium
-        cls.added_to_attachment_menu = bot_info.added_to_attachment_menu
-        cls.supports_inline_queries = bot_info.supports_inline_queries
-        cls.can_connect_to_business = bot_info.can_connect_to_business
-        cls.has_main_web_app = bot_info.has_main_web_app
-        cls.can_join_groups = getattr(bot_info, 'can_join_groups', False)
-        cls.can_read_all_group_messages = getattr(bot_info, 'can_read_all_group_messages', False)
-
-        return {
-            'id': cls.id,
-            'url': cls.url,
-            'first_name': cls.first_name,
-            'last_name': cls.last_name,
-            'username': cls.username,
-            'description': cls.description,
-            'short_description': cls.short_description,
-            'language_code': cls.language_code,
-            'prefix': cls.prefix,
-            'bot_owner': cls.bot_owner,
-            'is_premium': cls.is_premium,
-            'added_to_attachment_menu': cls.added_to_attachment_menu,
-            'supports_inline_queries': cls.supports_inline_queries,
-            'can_connect_to_business': cls.can_connect_to_business,
-            'has_main_web_app': cls.has_main_web_app,
-            'can_join_groups': cls.can_join_groups,
-            'can_read_all_group_messages': cls.can_read_all_group_messages,
-        }
+        # Поля User всегда объявлены (Optional), поэтому берём их одним срезом модели
+        data: dict = bot_info.model_dump(include=_BOT_INFO_FIELDS)
+        data["url"] = f"tg://user?id={data['id']}"
+        # У User нет описаний — они приходят из get_my_description / get_my_short_description
+        data["description"] = cls.description or ""
+        data["short_description"] = cls.short_description or ""
+
+        for key, value in data.items():
+            setattr(cls, key, value)
+
+        data.update(prefix=cls.prefix, bot_owner=cls.bot_owner)
+        return data
 
 
     @staticmethod
     @log(level='INFO', log_type='BOT', text='Установка прав администратора')
-    async def set_administrator_rights(bots: Bot = bot, rights: ChatAdministratorRights = BotEdit.RIGHTS) -> None:
+    async def set_administrator_rights(bots: Bot = bot, rights: ChatAdministratorRights = BotEdit.RIGHTS,
+                                       current_rights: Optional[ChatAdministratorRights] = None) -> None:
         """
         Устанавливает права администратора по умолчанию.
 
         :param bots: Объект бота для управления.
         :param rights: Заданные права администратора бота, по умолчанию словарь из конфигов.
+        :param current_rights: Уже полученные текущие права, иначе запрашиваются.
         """
-        bot_rights: ChatAdministratorRights = await bots.get_my_default_administrator_rights()
+        bot_rights: ChatAdministratorRights = current_rights or await bots.get_my_default_administrator_rights()
 
         if bot_rights != rights:
             await bots.set_my_default_administrator_rights(rights)
@@ -148,14 +256,17 @@ class BotInfo:
 
     @staticmethod
     @log(level='INFO', log_type='BOT', text='Обновление имени бота')
-    async def set_name(bots: Bot = bot, new_name: str = BotEdit.NAME) -> None:
+    async def set_name(bots: Bot = bot, new_name: str = BotEdit.NAME,
+                       current_name: Optional[str] = None) -> None:
         """
         Устанавливает имя бота из конфига.
 
         :param bots: Объект бота для управления.
         :param new_name: Новое имя бота, по умолчанию из конфигов.
+        :param current_name: Уже известное текущее имя (BotInfo.first_name), иначе запрашивается.
         """
-        current_name: str = (await bots.get_me()).first_name
+        if current_name is None:
+            current_name = (await bots.get_me()).first_name
 
         if not (1 <= len(new_name) <= 32):
             raise ValueError("Имя бота должно быть от 1 до 32 символов.")
@@ -166,42 +277,48 @@ class BotInfo:
 
     @staticmethod
     @log(level='INFO', log_type='BOT', text='Обновление описания бота')
-    async def set_description(bots: Bot = bot, new_description: str = BotEdit.DESCRIPTION) -> None:
+    async def set_description(bots: Bot = bot, new_description: str = BotEdit.DESCRIPTION,
+                              current_description: Optional[BotDescription] = None) -> None:
         """
         Устанавливает полное описание бота.
 
         :param bots: Объект бота для управления.
         :param new_description: Новое описание бота, по умолчанию из конфигов.
+        :param current_description: Уже полученное текущее описание, иначе запрашивается.
         """
-        current_description: BotDescription = await bots.get_my_description()
+        if current_description is None:
+            current_description = await bots.get_my_description()
 
         if not (0 < len(new_description) <= 255):
             raise ValueError("Описание должно быть от 1 до 255 символов.")
 
-        if current_description != new_description:
+        if current_description.description != new_description:
             await bots.set_my_description(description=new_description)
 
 
     @staticmethod
     @log(level='INFO', log_type='BOT', text='Обновление короткого описания бота')
-    async def set_short_description(bots: Bot = bot, new_short: str = BotEdit.SHORT_DESCRIPTION) -> None:
+    async def set_short_description(bots: Bot = bot, new_short: str = BotEdit.SHORT_DESCRIPTION,
+                                    current_short: Optional[BotShortDescription] = None) -> None:
         """
         Устанавливает короткое описание виджета.
 
         :param bots: Объект бота для управления.
         :param new_short: Новое короткое описание бота, по умолчанию из конфигов.
+        :param current_short: Уже полученное текущее короткое описание, иначе запрашивается.
         """
-        current_short: BotShortDescription = await bots.get_my_short_description()
+        if current_short is None:
+            current_short = await bots.get_my_short_description()
 
         if not (0 < len(new_short) <= 512):
             raise ValueError("Короткое описание должно быть от 1 до 512 символов.")
 
-        if current_short != new_short:
+        if current_short.short_description != new_short:
             await bots.set_my_short_description(short_description=new_short)
 
 
     @staticmethod
-    def start_info_out(out: bool = True) -> str:
+    async def start_info_out(out: bool = True) -> str:
         bot_time: str = f"Бот @{BotInfo.username} запущен в {datetime.now().strftime("%S:%M:%H %d-%m-%Y")}\n"
         bot_name: str = f"Основное имя: {BotInfo.first_name}\n"
         bot_postname: str = f" Доп. имя: {BotInfo.last_name}\n"
@@ -220,24 +337,31 @@ class BotInfo:
                         f"{bot_added_to_attachment_menu} {bot_supports_inline_queries} {bot_can_connect_to_business} "
                         f"{bot_has_main_web_app}")
 
-        # Печатаем все данные в консоль
-        if out:
-            print(f"\033[34m{bot_all_info}\033[0m")
-
-        # Записываем информацию в файл
+        # Вывод в консоль и запись в файлы — блокирующий ввод-вывод, выполняем вне цикла событий
         try:
-            with open("Logs/info.log", 'w', encoding='utf-8') as log_file:
-                log_file.write(f"{bot_time}{bot_all_info}")
-
-            # Создание файла bot_start.log
-            with open("Logs/bot_start.log", 'a', encoding='utf-8') as log_start_file:
-                log_start_file.write(f"{bot_time}\n")
+            await to_thread(BotInfo._write_start_info, bot_time, bot_all_info, out)
             return bot_all_info
 
         # Проверка на ошибку и ее логирование
         except Exception as e:
-            error: str = f"Ошибка при получении ID пользователя: {e}"
-            raise error
+            raise RuntimeError(f"Ошибка записи информации о запуске бота: {e}") from e
+
+    @staticmethod
+    def _write_start_info(bot_time: str, bot_all_info: str, out: bool) -> None:
+        """
+        Печатает информацию о боте и записывает её в файлы логов (синхронно).
+
+        :param bot_time: Строка с временем запуска.
+        :param bot_all_info: Текст с информацией о боте.
+        :param out: Печатать ли информацию в консоль.
+        """
+        # Печатаем все данные в консоль
+        if out:
+            print(f"\033[34m{bot_all_info}\033[0m")
+
+        # Записываем информацию в файл
+        _info_logger.info("%s%s", bot_time, bot_all_info)
+        _append_line("bot_start.log", f"{bot_time}\n")
 
 
     @classmethod
@@ -249,10 +373,17 @@ class BotInfo:
         :param perm: Разрешение на изменения бота.
         :param bots: Объект бота для управления.
         """
-        await cls.webhook(bots=bots)
-        await cls.info(bots=bots)
+        await gather(cls.webhook(bots=bots), cls.info(bots=bots))
         if perm:
-            await cls.set_administrator_rights(bots=bots)
-            await cls.set_description(bots=bots)
-            await cls.set_short_description(bots=bots)
-            await cls.set_name(bots=bots)
+            # Текущие значения запрашиваются параллельно, имя уже известно из info()
+            current_rights, current_description, current_short = await gather(
+                bots.get_my_default_administrator_rights(),
+                bots.get_my_description(),
+                bots.get_my_short_description(),
+            )
+            await gather(
+                cls.set_administrator_rights(bots=bots, current_rights=current_rights),
+                cls.set_description(bots=bots, current_description=current_description),
+                cls.set_short_description(bots=bots, current_short=current_short),
+                cls.set_name(bots=bots, current_name=cls.first_name),
+            )
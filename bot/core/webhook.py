@@ -1,18 +1,21 @@
+from asyncio import Task, create_task
 from typing import Any
 
 from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
 from uvicorn import Config, Server
 from aiogram.types import Update
 
 from configs import Webhook
+from middleware.loggers import loggers
 from .bots import dp, bot
 
 # Настройки экспорта
 __all__ = ("app", "config", "server",)
 
 
-# Создаём FastAPI приложение
-app: FastAPI = FastAPI()
+# Создаём FastAPI приложение (ответы сериализуются через orjson)
+app: FastAPI = FastAPI(default_response_class=ORJSONResponse)
 
 # Создаём конфиг для uvicorn
 config: Config = Config(
@@ -20,18 +23,63 @@ config: Config = Config(
     host=Webhook.WEBAPP_HOST,
     port=Webhook.WEBAPP_PORT,
     log_level=Webhook.LOG_LEVEL,  # выводить только предупреждения и ошибки
-    access_log=Webhook.ACCES_LOG  # <-- отключает все HTTP-access логи
+    access_log=Webhook.ACCES_LOG,  # <-- отключает все HTTP-access логи
+    http="auto",  # httptools, если установлен (иначе h11)
+    backlog=2048,
+    timeout_keep_alive=75,  # держим соединения Telegram открытыми между POST
 )
 
 # Создание вебхук-сервера
 server: Server = Server(config)
 
+# Сильные ссылки на фоновые задачи, чтобы их не собрал GC до завершения
+_BG: set[Task] = set()
+# Число принятых, но ещё не обработанных апдейтов (защита памяти при всплесках).
+# Слот занимается синхронно до create_task и освобождается по завершении задачи
+_inflight: int = 0
 
-@app.post("/webhook")
-async def telegram_webhook(request: Request) -> dict[str, Any]:
+
+async def _process_update(update: Update) -> None:
+    """
+    Обработка апдейта в фоне с логированием необработанных исключений.
+    """
+    try:
+        await dp.feed_update(bot, update)
+    except Exception as e:
+        loggers.error(text=f"Ошибка обработки апдейта {update.update_id}: {e!r}", log_type="WEBHOOK")
+
+
+def _release_slot(task: Task) -> None:
+    """
+    Освобождает слот апдейта по завершении задачи (срабатывает и при отмене до старта).
+    """
+    global _inflight
+    _inflight -= 1
+    _BG.discard(task)
+
+
+@app.post("/webhook", response_model=None)
+async def telegram_webhook(request: Request) -> dict[str, Any] | ORJSONResponse:
     """
     Обработчик POST-запроса от Telegram.
+    Апдейт обрабатывается в фоне, чтобы Telegram сразу получал ответ и слал следующий.
+    При заполненном лимите отвечает 429, и Telegram повторит доставку позже.
     """
-    update: Update = Update(**await request.json())
-    await dp.feed_update(bot, update)
+    global _inflight
+    # Быстрый отказ до чтения тела
+    if _inflight >= Webhook.MAX_INFLIGHT:
+        return ORJSONResponse(content={"ok": False}, status_code=429)
+
+    # Сырое тело разбирается pydantic напрямую, минуя json-обвязку FastAPI
+    raw: bytes = await request.body()
+    update: Update = Update.model_validate_json(raw, context={"bot": bot})
+
+    # Проверка и занятие слота без await между ними — всплеск не превысит MAX_INFLIGHT
+    if _inflight >= Webhook.MAX_INFLIGHT:
+        return ORJSONResponse(content={"ok": False}, status_code=429)
+    _inflight += 1
+
+    task: Task = create_task(_process_update(update))
+    _BG.add(task)
+    task.add_done_callback(_release_slot)
     return {"ok": True}
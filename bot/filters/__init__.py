@@ -1,4 +1,5 @@
 from .callback import *
+from .command import *
 from .chat_rights import *
 from .chat_type import *
 from .message_content import *
@@ -0,0 +1,63 @@
+from asyncio import Task, ensure_future, shield
+from time import monotonic
+from typing import Final, Union
+
+from aiogram import Bot
+from aiogram.types import ResultChatMemberUnion
+
+# Настройка экспорта
+__all__ = ("get_member_cached", "invalidate_member",)
+
+
+# Предельный размер кэша и время жизни записи по умолчанию (сек)
+_MAXSIZE: Final[int] = 10_000
+_TTL: Final[float] = 30.0
+
+# (chat_id, user_id) -> (участник, момент истечения)
+_cache: dict[tuple[Union[int, str], int], tuple[ResultChatMemberUnion, float]] = {}
+# (chat_id, user_id) -> выполняющийся запрос, общий для одновременных проверок
+_inflight: dict[tuple[Union[int, str], int], Task] = {}
+
+
+async def get_member_cached(bot: Bot, chat_id: Union[int, str], user_id: int,
+                            ttl: float = _TTL) -> ResultChatMemberUnion:
+    """
+    Возвращает участника чата с кэшированием на ttl секунд.
+    Одновременные запросы одной пары (chat_id, user_id) выполняют один HTTP-вызов.
+
+    :param bot: Объект бота для запроса.
+    :param chat_id: ID или @username чата.
+    :param user_id: ID пользователя.
+    :param ttl: Время жизни записи в кэше.
+    :return: Объект участника чата.
+    """
+    key: tuple[Union[int, str], int] = (chat_id, user_id)
+    hit = _cache.get(key)
+    if hit is not None and hit[1] > monotonic():
+        return hit[0]
+
+    task: Task | None = _inflight.get(key)
+    if task is None:
+        task = ensure_future(bot.get_chat_member(chat_id=chat_id, user_id=user_id))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+
+    # shield — отмена одного ожидающего не должна отменять общий запрос
+    member: ResultChatMemberUnion = await shield(task)
+
+    # Запись переносится в конец, чтобы вытеснение шло от самых старых
+    _cache.pop(key, None)
+    if len(_cache) >= _MAXSIZE:
+        del _cache[next(iter(_cache))]
+    _cache[key] = (member, monotonic() + ttl)
+    return member
+
+
+def invalidate_member(chat_id: Union[int, str], user_id: int) -> None:
+    """
+    Сбрасывает закэшированный статус участника (например, при ChatMemberUpdated).
+
+    :param chat_id: ID или @username чата.
+    :param user_id: ID пользователя.
+    """
+    _cache.pop((chat_id, user_id), None)
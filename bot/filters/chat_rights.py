@@ -3,6 +3,8 @@ from aiogram.filters import BaseFilter
 from aiogram.types import Message, ResultChatMemberUnion
 from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
 
+from ._membership_cache import get_member_cached
+
 # Настройка экспорта
 __all__ = ("IsChatCreator", "IsAdmin", "IsModerator",)
 
@@ -18,7 +20,7 @@ class IsChatCreator(BaseFilter):
     """
     async def __call__(self, message: Message, bot: Bot) -> bool:
         try:
-            member: ResultChatMemberUnion = await bot.get_chat_member(message.chat.id, message.from_user.id)
+            member: ResultChatMemberUnion = await get_member_cached(bot, message.chat.id, message.from_user.id)
             return member.status == "creator"
         except (TelegramBadRequest, TelegramForbiddenError):
             return False
@@ -35,7 +37,7 @@ class IsAdmin(BaseFilter):
     """
     async def __call__(self, message: Message, bot: Bot) -> bool:
         try:
-            member: ResultChatMemberUnion = await bot.get_chat_member(message.chat.id, message.from_user.id)
+            member: ResultChatMemberUnion = await get_member_cached(bot, message.chat.id, message.from_user.id)
             return member.status in {"administrator", "creator"}
         except (TelegramBadRequest, TelegramForbiddenError):
             return False
@@ -55,19 +57,18 @@ class IsModerator(BaseFilter):
     """
     async def __call__(self, message: Message, bot: Bot) -> bool:
         try:
-            member: ResultChatMemberUnion = await bot.get_chat_member(message.chat.id, message.from_user.id)
+            member: ResultChatMemberUnion = await get_member_cached(bot, message.chat.id, message.from_user.id)
 
             if member.status == "creator":
                 return True
             if member.status != "administrator":
                 return False
 
-            required_rights: list[bool] = [
-                getattr(member, "can_delete_messages", False),
-                getattr(member, "can_restrict_members", False),
-                getattr(member, "can_pin_messages", False),
-            ]
-            return all(required_rights)
+            return bool(
+                getattr(member, "can_delete_messages", False)
+                and getattr(member, "can_restrict_members", False)
+                and getattr(member, "can_pin_messages", False)
+            )
 
         except (TelegramBadRequest, TelegramForbiddenError):
             return False
@@ -1,3 +1,4 @@
+from aiogram.enums import ChatType
 from aiogram.filters import BaseFilter
 from aiogram.types import Message
 
@@ -15,7 +16,7 @@ class IsPrivate(BaseFilter):
             await msg.answer("Это ЛС ✅")
     """
     async def __call__(self, message: Message) -> bool:
-        return message.chat.type == "private"
+        return message.chat.type == ChatType.PRIVATE
 
 
 class IsGroup(BaseFilter):
@@ -27,5 +28,7 @@ class IsGroup(BaseFilter):
         async def handler(msg: Message):
             await msg.answer("Это сообщение в группе ✅")
     """
+    _GROUP: frozenset[str] = frozenset({ChatType.GROUP, ChatType.SUPERGROUP})
+
     async def __call__(self, message: Message) -> bool:
-        return message.chat.type in {"group", "supergroup"}
+        return message.chat.type in self._GROUP
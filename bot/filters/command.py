@@ -0,0 +1,71 @@
+from functools import lru_cache
+
+from aiogram import F
+from aiogram.filters import Command, CommandObject
+from aiogram.filters.command import CommandException
+from magic_filter import MagicFilter
+
+from configs import BotSettings, COMMANDS
+
+# Настройка экспорта
+__all__ = ("AliasCommand", "cmd", "callback_cmd",)
+
+
+# Алиасы команд в нижнем регистре, собранные один раз при импорте
+_ALIASES: dict[str, frozenset[str]] = {
+    name: frozenset(alias.casefold() for alias in aliases)
+    for name, aliases in COMMANDS.items()
+}
+
+
+class AliasCommand(Command):
+    """
+    Command с проверкой имени по множеству строковых алиасов.
+    Вместо перебора всех алиасов на апдейт — один casefold и поиск в frozenset;
+    разбор префикса и упоминания бота остаётся от Command.
+
+    Example:
+        @router.message(AliasCommand("start", "старт", ignore_case=True))
+    """
+    __slots__ = ("aliases",)
+
+    def __init__(self, *values: str, **kwargs) -> None:
+        super().__init__(*values, **kwargs)
+        self.aliases: frozenset[str] = frozenset(self.commands)
+
+    def validate_command(self, command: CommandObject) -> CommandObject:
+        name: str = command.command.casefold() if self.ignore_case else command.command
+        if name in self.aliases:
+            return command
+        raise CommandException("Command did not match pattern")
+
+
+@lru_cache(maxsize=None)
+def cmd(name: str, prefix: str = BotSettings.PREFIX) -> AliasCommand:
+    """
+    Возвращает общий фильтр Command для команды из COMMANDS.
+    Хендлеры одной команды получают один и тот же экземпляр.
+
+    Example:
+        @router.message(cmd("start"))
+
+    :param name: Ключ команды в COMMANDS.
+    :param prefix: Допустимые префиксы команды.
+    :return: Фильтр команды без учёта регистра.
+    """
+    return AliasCommand(*_ALIASES[name], prefix=prefix, ignore_case=True)
+
+
+@lru_cache(maxsize=None)
+def callback_cmd(name: str) -> MagicFilter:
+    """
+    Возвращает общий фильтр callback_data, равной имени команды.
+    callback_data задаются самим ботом в нижнем регистре, поэтому .lower() на апдейт не нужен.
+
+    Example:
+        @router.callback_query(callback_cmd("start"))
+
+    :param name: Имя команды.
+    :return: Фильтр magic-filter на точное совпадение.
+    """
+    return F.data == name.lower()
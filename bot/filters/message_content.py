@@ -1,9 +1,15 @@
+from re import compile
+
 from aiogram.filters import BaseFilter
 from aiogram.types import Message
 
 # Настройка экспорта
 __all__ = ("IsReply", "IsForwarded", "HasMedia", "ContainsURL",)
 
+# Предкомпилированный поиск ссылки и типы сущностей-ссылок Telegram
+_URL_SEARCH = compile(r"https?://").search
+_URL_ENTITIES: frozenset[str] = frozenset({"url", "text_link"})
+
 
 class IsReply(BaseFilter):
     """
@@ -28,7 +34,7 @@ class IsForwarded(BaseFilter):
             await msg.answer("Это пересланное сообщение 🔄")
     """
     async def __call__(self, message: Message) -> bool:
-        return (message.forward_from is not None) or (message.forward_from_chat is not None)
+        return bool(message.forward_from or message.forward_from_chat)
 
 
 class HasMedia(BaseFilter):
@@ -41,15 +47,16 @@ class HasMedia(BaseFilter):
             await msg.answer("Это медиа ✅")
     """
     async def __call__(self, message: Message) -> bool:
-        return any([
-            message.photo,
-            message.video,
-            message.document,
-            message.audio,
-            message.voice,
-            message.video_note,
-            message.sticker,
-        ])
+        # Цепочка or останавливается на первом найденном медиа без создания списка
+        return bool(
+            message.photo
+            or message.video
+            or message.document
+            or message.audio
+            or message.voice
+            or message.video_note
+            or message.sticker
+        )
 
 
 class ContainsURL(BaseFilter):
@@ -62,6 +69,11 @@ class ContainsURL(BaseFilter):
             await msg.answer("Это сообщение с ссылкой 🔗")
     """
     async def __call__(self, message: Message) -> bool:
-        if not message.text:
-            return False
-        return "http://" in message.text or "https://" in message.text
+        # Сначала сущности, которые Telegram уже разобрал на своей стороне
+        entities = message.entities or message.caption_entities
+        if entities and any(entity.type in _URL_ENTITIES for entity in entities):
+            return True
+
+        # Иначе — один проход регулярным выражением по тексту или подписи
+        text: str | None = message.text or message.caption
+        return text is not None and _URL_SEARCH(text) is not None
@@ -1,9 +1,13 @@
+from asyncio import Task, as_completed, create_task
+
 from aiogram.types import Message, ResultChatMemberUnion
 from aiogram.filters import BaseFilter
 from aiogram import Bot
 from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
 from typing import Union
 
+from ._membership_cache import get_member_cached
+
 # Настройки экспорта
 __all__ = ("FilterSubscribed",)
 
@@ -23,17 +27,26 @@ class FilterSubscribed(BaseFilter):
         self.channels = channels
 
     async def __call__(self, message: Message, bot: Bot) -> bool:
-        for channel in self.channels:
+        async def check(channel: Union[str, int]) -> bool:
             try:
-                member: ResultChatMemberUnion = await bot.get_chat_member(
+                member: ResultChatMemberUnion = await get_member_cached(
+                    bot,
                     chat_id=channel,
                     user_id=message.from_user.id
                 )
-                if member.status in ("left", "kicked"):
-                    return False
+                return member.status not in ("left", "kicked")
 
             except (TelegramBadRequest, TelegramForbiddenError):
                 # Канал недоступен, либо у бота нет прав
                 return False
 
-        return True
+        # Все каналы проверяются параллельно, первый отказ отменяет остальные
+        tasks: list[Task] = [create_task(check(channel)) for channel in self.channels]
+        try:
+            for result in as_completed(tasks):
+                if not await result:
+                    return False
+            return True
+        finally:
+            for task in tasks:
+                task.cancel()
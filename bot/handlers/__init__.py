@@ -1,14 +1,20 @@
 from aiogram import Router
-from bot.handlers.commands import router as cmd_routers
-from .messages import router as messages_routers
+from .events.chat_member import router as chat_member_router
+from .commands.admins.settings_cmd import router as settings_cmd_router
+from .commands.users.start_cmd import router as start_cmd_router
+from .commands.users.active import router as active_cmd_router
+from .messages.default import router as default_message_router
 
 # Настройка экспорта и роутера
 __all__ = ("router",)
 router: Router = Router(name=__name__)
 
-# Подключение роутеров
+# Подключение роутеров одним плоским уровнем (порядок важен:
+# служебные события, команды, затем обработчик сообщений по умолчанию)
 router.include_routers(
-    cmd_routers,
-    messages_routers,
-
+    chat_member_router,
+    settings_cmd_router,
+    start_cmd_router,
+    active_cmd_router,
+    default_message_router,
 )
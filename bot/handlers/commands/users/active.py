@@ -1,11 +1,11 @@
-from aiogram import Router, F
-from aiogram.filters import Command
+import logging
+
+from aiogram import Router
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message, CallbackQuery
 
 from bot.templates import msg_photo
-from bot.core.bots import BotInfo
-from configs import COMMANDS
+from bot.filters import cmd, callback_cmd
 from database import db
 
 
@@ -16,21 +16,23 @@ __all__ = ("router",)
 
 CMD: str = "active".lower()
 router: Router = Router(name=f"{CMD}_cmd_router")
+logger: logging.Logger = logging.getLogger(__name__)
 
 
-@router.callback_query(F.data.lower() == CMD)
-@router.message(Command(*COMMANDS[CMD], prefix=BotInfo.prefix, ignore_case=True))
+@router.callback_query(callback_cmd(CMD))
+@router.message(cmd(CMD))
 async def active_cmd(message: Message | CallbackQuery, state: FSMContext) -> None:
     """Обработчик команды /active"""
     await state.clear()
 
+    # Дождаться записи сообщений из очереди, чтобы статистика учитывала и текущее
+    await db.flush()
+
     # Получить статистику сообщений пользователя
     day, week, month, total = await db.get_message_stats(message.from_user.id)
 
-    print(f"За день: {day} сообщений")
-    print(f"За неделю: {week} сообщений")
-    print(f"За месяц: {month} сообщений")
-    print(f"Всего: {total} сообщений")
+    logger.debug("stats uid=%s day=%s week=%s month=%s total=%s",
+                 message.from_user.id, day, week, month, total)
 
     # Формируем приветственное сообщение
     text: str =f"""
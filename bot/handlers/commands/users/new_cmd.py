@@ -1,44 +1,102 @@
 import re
-from typing import Optional, Dict, Tuple
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Optional, Dict, Mapping, Tuple
 
 from aiogram import Router, F
-from aiogram.filters import Command
+from aiogram.exceptions import TelegramAPIError
 from aiogram.fsm.context import FSMContext
-from aiogram.types import Message, CallbackQuery, InlineKeyboardButton
+from aiogram.types import Message, CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from aiogram.utils.i18n import gettext as _
 
-from bot.core.bots import BotInfo
+from bot.filters import cmd, callback_cmd
 from bot.keyboards.inline.decision import decision_keyboard
 from bot.states.new_states import NewStates
 from bot.templates import msg
 from middleware.loggers import log
-from configs import COMMANDS, ImportantID, RpValue
+from configs import ImportantID, RpValue
+
+
+class _LRU(OrderedDict):
+    """
+    Словарь с ограниченным размером: при переполнении вытесняется запись,
+    к которой дольше всего не обращались (чтение и запись обновляют давность).
+    """
+
+    def __init__(self, maxsize: int = 10_000) -> None:
+        super().__init__()
+        self.maxsize: int = maxsize
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def get(self, key, default=None):
+        # OrderedDict.get не вызывает __getitem__ — давность обновляем явно
+        if key in self:
+            self.move_to_end(key)
+            return super().__getitem__(key)
+        return default
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            del self[next(iter(self))]
+
 
 # Глобальная мапа для хранения связей пользователь-топик
-user_topic_map: Dict[Tuple[int, str], int] = {}
+user_topic_map: Dict[Tuple[int, str], int] = _LRU(maxsize=10_000)
+# Обратный индекс: топик -> (пользователь, тип топика)
+thread_to_user: Dict[int, Tuple[int, str]] = _LRU(maxsize=10_000)
 
 __all__ = ("router",)
 CMD: str = "new"
 router: Router = Router(name=f"{CMD}_cmd_router")
 TOPIC_TYPE: str = "anketa"
 
-TEXTS: Dict[str, Dict[str, str]] = {
-    "anketa": {
+# Тексты ответов пользователю (только для чтения)
+TEXTS: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    "anketa": MappingProxyType({
         "accept": f"<b>🎉 Ваша анкета принята!</b>\n\nДобро пожаловать в проект!\n\nФлуд: {RpValue.FLUD_URL}\nРолевая: {RpValue.RP_URL}",
         "reject": "<b>❌ Ваша анкета отклонена.</b>\n\nВы можете попробовать позже."
-    }
-}
+    })
+})
+
+# Плоская таблица (тип, действие) -> текст: один поиск вместо двух
+TEXTS_FLAT: Mapping[Tuple[str, str], str] = MappingProxyType({
+    (kind, action): text for kind, inner in TEXTS.items() for action, text in inner.items()
+})
+
+
+# Клавиатуры-константы: собираются один раз при импорте
+_CANCEL_KB: InlineKeyboardMarkup = InlineKeyboardBuilder().row(
+    InlineKeyboardButton(text="Отмена↩️", callback_data='start')
+).as_markup()
+_SUBMIT_KB: InlineKeyboardMarkup = InlineKeyboardBuilder().row(
+    InlineKeyboardButton(text="Отправить!", callback_data="submit_new"),
+    InlineKeyboardButton(text="Отмена↩️", callback_data="start")
+).as_markup()
 
 
-async def validate_russian_text(text: str) -> bool:
+# Допустимые символы роли и сортола: русские буквы (А-я, Ё, ё) и дефис;
+# пробельные символы отсекаются отдельно через strip()
+_RU_DELETE: dict[int, None] = str.maketrans("", "", "".join(map(chr, range(0x0410, 0x0450))) + "Ёё-")
+# callback_data решения админов: <тип>:<accept|reject>:<thread_id>
+_DECISION_RE: re.Pattern = re.compile(r"^([a-z_]+):(accept|reject):(\d+)$")
+
+
+def validate_russian_text(text: Optional[str]) -> bool:
     """Проверяет текст на соответствие русским буквам, пробелам и дефисам."""
-    return bool(re.fullmatch(r"[А-Яа-яЁё\s\-]+", text))
+    # Удаляем все допустимые символы — должны остаться только пробельные
+    return bool(text) and not text.translate(_RU_DELETE).strip()
 
 
 # ===================== Команда /new =====================
-@router.callback_query(F.data == CMD)
-@router.message(Command(*COMMANDS[CMD], prefix=BotInfo.prefix, ignore_case=True))
+@router.callback_query(callback_cmd(CMD))
+@router.message(cmd(CMD))
 @log(level='INFO', log_type=CMD.upper(), text=f"использовал команду /{CMD}")
 async def new_cmd(message: Message | CallbackQuery, state: FSMContext) -> None:
     """
@@ -48,34 +106,28 @@ async def new_cmd(message: Message | CallbackQuery, state: FSMContext) -> None:
     await state.clear()
     await state.set_state(NewStates.role)
 
-    ikb: InlineKeyboardBuilder = InlineKeyboardBuilder()
-    ikb.row(InlineKeyboardButton(text="Отмена↩️", callback_data='start'))
-
     text: str = _(
         "Пожалуйста, отправьте желаемую роль:\n"
         "(только русские буквы, пробелы или дефисы)"
     )
 
-    await msg(message=message, text=text, markup=ikb)
+    await msg(message=message, text=text, markup=_CANCEL_KB)
 
 
 # ===================== Обработка роли =====================
 @router.message(NewStates.role)
 async def process_role(message: Message, state: FSMContext) -> None:
     """Обрабатывает ввод роли и запрашивает сортол."""
-    if not await validate_russian_text(message.text):
+    if not validate_russian_text(message.text):
         await message.reply("Ошибка: роль должна содержать только русские буквы, пробелы или дефисы.")
         return
 
     await state.update_data(role=message.text.strip().title())
     await state.set_state(NewStates.sorol)
 
-    ikb: InlineKeyboardBuilder = InlineKeyboardBuilder()
-    ikb.row(InlineKeyboardButton(text="Отмена↩️", callback_data='start'))
-
     await message.reply(
         text="Теперь укажите желаемый сортол:\n(только русские буквы, пробелы или дефисы)",
-        reply_markup=ikb.as_markup()
+        reply_markup=_CANCEL_KB
     )
 
 
@@ -83,19 +135,16 @@ async def process_role(message: Message, state: FSMContext) -> None:
 @router.message(NewStates.sorol)
 async def process_sortol(message: Message, state: FSMContext) -> None:
     """Обрабатывает ввод сортола и запрашивает кодовую фразу."""
-    if not await validate_russian_text(message.text):
+    if not validate_russian_text(message.text):
         await message.reply("Ошибка: сорол должен содержать только русские буквы, пробелы или дефисы.")
         return
 
     await state.update_data(sortol=message.text.strip().title())
     await state.set_state(NewStates.code_phrase)
 
-    ikb: InlineKeyboardBuilder = InlineKeyboardBuilder()
-    ikb.row(InlineKeyboardButton(text="Отмена↩️", callback_data='start'))
-
     await message.reply(
         text="Теперь введите кодовую фразу из правил:",
-        reply_markup=ikb.as_markup()
+        reply_markup=_CANCEL_KB
     )
 
 
@@ -111,12 +160,6 @@ async def process_code_phrase(message: Message, state: FSMContext) -> None:
     await state.update_data(code_phrase=code_phrase)
     data: Dict[str, str] = await state.get_data()
 
-    ikb: InlineKeyboardBuilder = InlineKeyboardBuilder()
-    ikb.row(
-        InlineKeyboardButton(text="Отправить!", callback_data="submit_new"),
-        InlineKeyboardButton(text="Отмена↩️", callback_data="start")
-    )
-
     text: str = (
         f"<b>Проверьте данные анкеты:</b>\n\n"
         f"• Роль: {data['role']}\n"
@@ -124,7 +167,7 @@ async def process_code_phrase(message: Message, state: FSMContext) -> None:
         f"• Кодовая фраза: {data['code_phrase']}"
     )
 
-    await message.reply(text, reply_markup=ikb.as_markup())
+    await message.reply(text, reply_markup=_SUBMIT_KB)
 
 
 # ===================== Отправка анкеты в поддержку =====================
@@ -141,8 +184,12 @@ async def submit_new_cmd(callback: CallbackQuery, state: FSMContext) -> None:
     )
     thread_id: int = topic.message_thread_id
 
-    # Сохраняем связь пользователь-топик
+    # Сохраняем связь пользователь-топик; прежний топик пользователя (повторная анкета) отвязываем
+    previous_thread_id: Optional[int] = user_topic_map.get((user.id, TOPIC_TYPE))
+    if previous_thread_id is not None:
+        thread_to_user.pop(previous_thread_id, None)
     user_topic_map[(user.id, TOPIC_TYPE)] = thread_id
+    thread_to_user[thread_id] = (user.id, TOPIC_TYPE)
 
     # Формируем текст анкеты
     text: str = (
@@ -152,38 +199,44 @@ async def submit_new_cmd(callback: CallbackQuery, state: FSMContext) -> None:
         f"• Кодовая фраза: {data['code_phrase']}"
     )
 
-    # Отправляем в топик с кнопками принятия/отклонения
-    await callback.bot.send_message(
-        chat_id=ImportantID.SUPPORT_CHAT_ID,
-        message_thread_id=thread_id,
-        text=text,
-        parse_mode="HTML",
-        reply_markup=decision_keyboard(thread_id=thread_id, kind=TOPIC_TYPE)
-    )
+    # Отправляем в топик с кнопками принятия/отклонения; подтверждение — только после успешной отправки
+    try:
+        await callback.bot.send_message(
+            chat_id=ImportantID.SUPPORT_CHAT_ID,
+            message_thread_id=thread_id,
+            text=text,
+            parse_mode="HTML",
+            reply_markup=decision_keyboard(thread_id=thread_id, kind=TOPIC_TYPE)
+        )
+    except TelegramAPIError:
+        # Анкета не дошла: состояние сохраняем, чтобы пользователь мог отправить её повторно
+        await callback.message.edit_text(
+            "⚠️ Не удалось отправить анкету. Попробуйте ещё раз позже.",
+            reply_markup=_SUBMIT_KB,
+        )
+        return
 
     await callback.message.edit_text("✅ Ваша анкета успешно отправлена на рассмотрение!")
     await state.clear()
 
 
 # ===================== Обработка решения админов =====================
-@router.callback_query(F.data.regexp(r"^([a-z_]+):(accept|reject):(\d+)$"))
-async def process_decision_callback(callback: CallbackQuery) -> None:
+@router.callback_query(F.data.regexp(_DECISION_RE).as_("decision"))
+async def process_decision_callback(callback: CallbackQuery, decision: re.Match) -> None:
     """Обрабатывает решение администраторов и отправляет результат пользователю."""
-    kind, action, thread_id_str = callback.data.split(":")
-    thread_id = int(thread_id_str)
+    # Группы берутся из совпадения фильтра, повторный разбор не нужен
+    kind, action, thread_id_str = decision.groups()
+    thread_id: int = int(thread_id_str)
 
-    # Ищем пользователя по thread_id в мапе
-    user_id = None
-    for (uid, k), tid in user_topic_map.items():
-        if k == kind and tid == thread_id:
-            user_id = uid
-            break
+    # Ищем пользователя по thread_id в обратном индексе
+    entry: Optional[Tuple[int, str]] = thread_to_user.get(thread_id)
+    user_id: Optional[int] = entry[0] if entry and entry[1] == kind else None
 
     if not user_id:
         await callback.answer("Пользователь не найден.", show_alert=True)
         return
 
-    text_to_send: Optional[str] = TEXTS.get(kind, {}).get(action)
+    text_to_send: Optional[str] = TEXTS_FLAT.get((kind, action))
     if not text_to_send:
         await callback.answer("Некорректные данные.", show_alert=True)
         return
@@ -202,11 +255,8 @@ async def forward_reply_to_user(message: Message) -> None:
         return
 
     # Ищем пользователя по thread_id
-    user_id = None
-    for (uid, _), tid in user_topic_map.items():
-        if tid == thread_id:
-            user_id = uid
-            break
+    entry: Optional[Tuple[int, str]] = thread_to_user.get(thread_id)
+    user_id: Optional[int] = entry[0] if entry else None
 
     if not user_id:
         return
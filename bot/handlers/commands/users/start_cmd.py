@@ -1,5 +1,4 @@
-from aiogram import Router, F
-from aiogram.filters import Command
+from aiogram import Router
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message, CallbackQuery, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
@@ -7,8 +6,8 @@ from aiogram.utils.i18n import gettext as _
 
 from bot.templates import msg_photo
 from bot.utils.interesting_facts import interesting_fact
-from bot.core.bots import BotInfo
-from configs import COMMANDS, RpValue
+from bot.filters import cmd, callback_cmd
+from configs import RpValue
 
 # Настройки экспорта и роутера
 __all__ = ("router",)
@@ -16,8 +15,8 @@ CMD: str = "start".lower()
 router: Router = Router(name=f"{CMD}_cmd_router")
 
 
-@router.callback_query(F.data.lower() == CMD)
-@router.message(Command(*COMMANDS[CMD], prefix=BotInfo.prefix, ignore_case=True))
+@router.callback_query(callback_cmd(CMD))
+@router.message(cmd(CMD))
 async def start_cmd(message: Message | CallbackQuery, state: FSMContext) -> None:
     """Обработчик команды /start"""
     await state.clear()
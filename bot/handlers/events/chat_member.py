@@ -0,0 +1,17 @@
+from aiogram import Router
+from aiogram.types import ChatMemberUpdated
+
+from bot.filters._membership_cache import invalidate_member
+
+# Настройки экспорта и роутера
+__all__ = ("router",)
+router: Router = Router(name="chat_member_router")
+
+
+@router.chat_member()
+async def chat_member_updated(event: ChatMemberUpdated) -> None:
+    """Сбрасывает кэш статуса участника при изменении его членства в чате."""
+    user_id: int = event.new_chat_member.user.id
+    invalidate_member(event.chat.id, user_id)
+    if event.chat.username:
+        invalidate_member(f"@{event.chat.username}", user_id)
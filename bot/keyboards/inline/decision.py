@@ -1,6 +1,10 @@
-from aiogram.utils.keyboard import InlineKeyboardBuilder
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
+# Подписи кнопок решения
+_ACCEPT_TXT: str = "✅ Принять"
+_REJECT_TXT: str = "❌ Отклонить"
+
+
 def decision_keyboard(thread_id: int, kind: str) -> InlineKeyboardMarkup:
     """
     Получение клавиатуры Принятия\Отклонить.
@@ -9,9 +13,8 @@ def decision_keyboard(thread_id: int, kind: str) -> InlineKeyboardMarkup:
     :param kind: Вид для клавиатуры.
     :return: Инлайн-клавиатуру (Принять, Отклонить).
     """
-    ikb: InlineKeyboardBuilder = InlineKeyboardBuilder()
-    ikb.row(
-        InlineKeyboardButton(text="✅ Принять", callback_data=f"{kind}:accept:{thread_id}"),
-        InlineKeyboardButton(text="❌ Отклонить", callback_data=f"{kind}:reject:{thread_id}")
-    )
-    return ikb.as_markup()
+    # thread_id уникален для каждой анкеты, поэтому разметка собирается напрямую, без билдера
+    return InlineKeyboardMarkup(inline_keyboard=[[
+        InlineKeyboardButton(text=_ACCEPT_TXT, callback_data=f"{kind}:accept:{thread_id}"),
+        InlineKeyboardButton(text=_REJECT_TXT, callback_data=f"{kind}:reject:{thread_id}"),
+    ]])
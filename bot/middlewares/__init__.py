@@ -27,15 +27,20 @@ def setup_middlewares(dp: Dispatcher, bot: Bot, channel_ids: list[int | str] = N
 
     # Middleware для ВСЕХ событий (update level)
     middlewares_updates: list = [
-        TimingMiddleware(),  # Замер времени
         LoggingMiddleware(),  # Логирование
         ErrorHandlingMiddleware(admin_ids=ImportantID.ADMIN_ID),  # Обработка ошибок
     ]
 
-    # Middleware только для СООБЩЕНИЙ (message level)
-    middlewares_msg: list = [
+    # Middleware для СООБЩЕНИЙ и КОЛБЭКОВ: регистрируются на их наблюдателях,
+    # поэтому внутри не нужно проверять тип события
+    middlewares_events: list = [
+        TimingMiddleware(),  # Замер времени
         #RateLimitMiddleware(rate_limit=3, time_period=5.0),  # Антифлуд
         #SubscriptionMiddleware(bot=bot, channel_ids=channel_ids),  # Проверка подписки
+    ]
+
+    # Middleware только для СООБЩЕНИЙ (message level)
+    middlewares_msg: list = [
         MessageCounterMiddleware(),  # Подсчет сообщений
     ]
 
@@ -43,6 +48,11 @@ def setup_middlewares(dp: Dispatcher, bot: Bot, channel_ids: list[int | str] = N
     for middleware in middlewares_updates:
         dp.update.middleware(middleware)
 
+    # Один экземпляр на оба наблюдателя — общие счётчики и кэши
+    for middleware in middlewares_events:
+        dp.message.middleware(middleware)
+        dp.callback_query.middleware(middleware)
+
     # Регистрируем middleware только для сообщений
     for middleware in middlewares_msg:
         dp.message.middleware(middleware)
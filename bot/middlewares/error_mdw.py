@@ -1,8 +1,10 @@
-from typing import Callable, Awaitable, Any, Dict
-from aiogram import BaseMiddleware
+from asyncio import gather
+from typing import Callable, Awaitable, Any, Dict, Optional
+from aiogram import BaseMiddleware, Bot
 from aiogram.types import TelegramObject, Message, CallbackQuery, Update
 
 from middleware.loggers import loggers  # ваш логгер
+from bot.utils import user_tag
 
 
 class ErrorHandlingMiddleware(BaseMiddleware):
@@ -38,8 +40,8 @@ class ErrorHandlingMiddleware(BaseMiddleware):
             return await handler(event, data)
 
         except Exception as e:
-            # Получаем информацию о пользователе безопасным способом
-            user_str = self._extract_user_info(event)
+            # Берём пользователя, уже найденного LoggingMiddleware, иначе вычисляем сами
+            user_str = data.get("_user_str") or self._extract_user_info(event)
 
             # Логируем ошибку
             error_message = f"Ошибка в хендлере: {type(e).__name__}: {str(e)}"
@@ -69,17 +71,15 @@ class ErrorHandlingMiddleware(BaseMiddleware):
         Returns:
             Строка с идентификатором пользователя
         """
-        user_str = "@System"
+        user_object = None
 
         # Для Message и CallbackQuery
-        if isinstance(event, (Message, CallbackQuery)) and hasattr(event, 'from_user') and event.from_user:
-            user = event.from_user
-            user_str = f"@{user.username}" if user.username else f"id{user.id}"
+        if isinstance(event, (Message, CallbackQuery)):
+            user_object = getattr(event, 'from_user', None)
 
         # Для Update (который содержит message или callback_query)
         elif isinstance(event, Update):
             # Пытаемся найти пользователя в различных полях Update
-            user_object = None
             if event.message and event.message.from_user:
                 user_object = event.message.from_user
             elif event.edited_message and event.edited_message.from_user:
@@ -91,10 +91,7 @@ class ErrorHandlingMiddleware(BaseMiddleware):
             elif event.edited_channel_post and event.edited_channel_post.from_user:
                 user_object = event.edited_channel_post.from_user
 
-            if user_object:
-                user_str = f"@{user_object.username}" if user_object.username else f"id{user_object.id}"
-
-        return user_str
+        return user_tag(user_object)
 
     @staticmethod
     def _extract_event_text(event: TelegramObject) -> str:
@@ -110,11 +107,13 @@ class ErrorHandlingMiddleware(BaseMiddleware):
         event_text = ""
 
         # Для Message
-        if isinstance(event, Message) and hasattr(event, 'text') and event.text:
-            event_text = event.text
+        if isinstance(event, Message):
+            event_text = getattr(event, 'text', None) or ""
         # Для CallbackQuery
-        elif isinstance(event, CallbackQuery) and hasattr(event, 'data') and event.data:
-            event_text = f"callback: {event.data}"
+        elif isinstance(event, CallbackQuery):
+            data = getattr(event, 'data', None)
+            if data:
+                event_text = f"callback: {data}"
         # Для Update
         elif isinstance(event, Update):
             if event.message and event.message.text:
@@ -124,7 +123,7 @@ class ErrorHandlingMiddleware(BaseMiddleware):
             elif event.edited_message and event.edited_message.text:
                 event_text = event.edited_message.text
 
-        return event_text[:100] + "..." if len(event_text) > 100 else event_text
+        return event_text if len(event_text) <= 100 else event_text[:100] + "…"
 
     async def _notify_admins(
             self,
@@ -132,25 +131,26 @@ class ErrorHandlingMiddleware(BaseMiddleware):
             event: TelegramObject,
             user_str: str
     ) -> None:
-        """Уведомляет администраторов об ошибке."""
-        from aiogram import Bot
-        bot: Bot = event.bot if hasattr(event, 'bot') else None
+        """Уведомляет администраторов об ошибке (всем параллельно)."""
+        bot: Optional[Bot] = getattr(event, 'bot', None)
+
+        # Без получателей текст уведомления не собираем вовсе
+        if bot and self.admin_ids:
+            # Текст уведомления не зависит от администратора — собираем один раз
+            event_info = f"Событие: {type(event).__name__}"
+            event_text = self._extract_event_text(event)
+            if event_text:
+                event_info += f", текст: {event_text}"
+
+            full_message = (
+                f"🚨 Ошибка в боте:\n\n"
+                f"Пользователь: {user_str}\n"
+                f"Ошибка: {error_message}\n"
+                f"{event_info}"
+            )
 
-        if bot:
-            for admin_id in self.admin_ids:
+            async def _send_one(admin_id: int) -> None:
                 try:
-                    event_info = f"Событие: {type(event).__name__}"
-                    event_text = self._extract_event_text(event)
-                    if event_text:
-                        event_info += f", текст: {event_text}"
-
-                    full_message = (
-                        f"🚨 Ошибка в боте:\n\n"
-                        f"Пользователь: {user_str}\n"
-                        f"Ошибка: {error_message}\n"
-                        f"{event_info}"
-                    )
-
                     await bot.send_message(admin_id, full_message)
 
                     loggers.info(
@@ -166,6 +166,8 @@ class ErrorHandlingMiddleware(BaseMiddleware):
                         user=user_str
                     )
 
+            await gather(*(_send_one(admin_id) for admin_id in self.admin_ids), return_exceptions=True)
+
     @staticmethod
     async def _send_error_message(
             event: TelegramObject,
@@ -1,8 +1,8 @@
-from typing import Callable, Awaitable, Any, Dict, Optional, Tuple, Set
+from typing import Callable, Awaitable, Any, Dict, Optional, Tuple, FrozenSet
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject, Update, Message, CallbackQuery, MaybeInaccessibleMessageUnion, User
 
-from bot.utils import type_msg
+from bot.utils import type_msg, user_tag
 from middleware.loggers import loggers  # ваш глобальный логгер
 from configs import BotSettings, COMMANDS  # импортируем настройки и команды
 
@@ -22,20 +22,19 @@ class LoggingMiddleware(BaseMiddleware):
     # Префикс проекта для логов
     PROJECT_PREFIX: str = "PRIMO"
 
-    # Кэш для всех команд из COMMANDS
-    _all_commands: Optional[Set[str]] = None
+    # Все команды из COMMANDS, собранные один раз при импорте
+    _ALL_COMMANDS: FrozenSet[str] = frozenset(
+        command for command_list in COMMANDS.values() for command in command_list
+    )
 
-    def __init__(self):
-        super().__init__()
-        # Предварительно загружаем все команды
-        self._load_all_commands()
+    # Префиксы команд из BotSettings вместе со стандартным '/' (порядок сохраняется)
+    _PREFIXES_WITH_SLASH: Tuple[str, ...] = tuple(dict.fromkeys(BotSettings.PREFIX + '/'))
+    # Первые символы префиксов — быстрый отсев обычных сообщений
+    _PREFIX_FIRST_CHARS: FrozenSet[str] = frozenset(prefix[0] for prefix in _PREFIXES_WITH_SLASH)
 
-    def _load_all_commands(self) -> None:
-        """Загружает все команды из COMMANDS в множество для быстрого поиска."""
-        if self._all_commands is None:
-            self._all_commands = set()
-            for command_list in COMMANDS.values():
-                self._all_commands.update(command_list)
+    # Типы апдейтов, которые не логируются (бот на них не реагирует);
+    # переопределяется в наследнике или экземпляре
+    _SKIP_UPDATE_KINDS: FrozenSet[str] = frozenset({"channel_post", "edited_channel_post"})
 
     def _is_command(self, text: str) -> bool:
         """
@@ -47,23 +46,17 @@ class LoggingMiddleware(BaseMiddleware):
         Returns:
             True если это команда, False если нет
         """
-        if not text:
+        if not text or text[0] not in LoggingMiddleware._PREFIX_FIRST_CHARS:
             return False
 
-        # Проверяем все префиксы из BotSettings
-        for prefix in BotSettings.PREFIX:
+        prefixes: Tuple[str, ...] = LoggingMiddleware._PREFIXES_WITH_SLASH
+        if not text.startswith(prefixes):
+            return False
+
+        # Находим совпавший префикс и проверяем команду без него
+        for prefix in prefixes:
             if text.startswith(prefix):
-                # Извлекаем команду без префикса
-                command_without_prefix = text[len(prefix):].strip()
-                # Проверяем, есть ли такая команда в нашем списке
-                if command_without_prefix in self._all_commands:
-                    return True
-
-        # Также проверяем команды с префиксом / (стандартные)
-        if text.startswith('/'):
-            command_without_slash = text[1:].strip()
-            if command_without_slash in self._all_commands:
-                return True
+                return text[len(prefix):].strip() in LoggingMiddleware._ALL_COMMANDS
 
         return False
 
@@ -78,12 +71,14 @@ class LoggingMiddleware(BaseMiddleware):
         Returns:
             Название команды без префикса
         """
-        for prefix in BotSettings.PREFIX:
-            if text.startswith(prefix):
-                return text[len(prefix):].strip()
+        if not text or text[0] not in LoggingMiddleware._PREFIX_FIRST_CHARS:
+            return text
 
-        if text.startswith('/'):
-            return text[1:].strip()
+        for prefix in LoggingMiddleware._PREFIXES_WITH_SLASH:
+            stripped: str = text.removeprefix(prefix)
+            # Префиксы непустые: изменилась длина — значит префикс совпал
+            if len(stripped) != len(text):
+                return stripped.strip()
 
         return text
 
@@ -108,22 +103,32 @@ class LoggingMiddleware(BaseMiddleware):
         Raises:
             Exception: Любое исключение, возникшее при обработке хендлером
         """
+        # Быстрый выход для апдейтов, которые не нужно логировать
+        # (в апдейте заполнено ровно одно поле, поэтому достаточно проверить пропускаемые)
+        if isinstance(event, Update) and any(
+                getattr(event, kind, None) is not None for kind in self._SKIP_UPDATE_KINDS):
+            return await handler(event, data)
+
         # Определяем тип события и информацию для логирования
         log_type: str
-        log_text: str
+        log_text: Tuple[Any, ...]
         message_obj: Optional[Message]
+        from_user: Optional[User]
 
-        log_type, log_text, message_obj = self._determine_event_type(event)
+        log_type, log_text, message_obj, from_user = self._determine_event_type(event)
 
         # Добавляем префикс проекта к типу лога
         prefixed_log_type: str = f"{log_type}"
 
         # Определяем информацию о пользователе
-        user_str: str = self._extract_user_info(event, message_obj)
+        user_str: str = self._extract_user_info(from_user)
+        # Сохраняем для следующих middleware (например, ErrorHandlingMiddleware)
+        data["_user_str"] = user_str
 
         # Логируем получение события с префиксом проекта
+        # (шаблон и аргументы форматируются, только если запись выводится)
         loggers.info(
-            text=log_text,
+            *log_text,
             log_type=prefixed_log_type,
             user=user_str
         )
@@ -135,7 +140,7 @@ class LoggingMiddleware(BaseMiddleware):
             # Логируем успешное выполнение для команд
             if log_type == "CMD":
                 loggers.info(
-                    text=f"[SUCCESS] команда обработана",
+                    text="[SUCCESS] команда обработана",
                     log_type=prefixed_log_type,
                     user=user_str
                 )
@@ -145,7 +150,7 @@ class LoggingMiddleware(BaseMiddleware):
         except Exception as e:
             # Логируем ошибку при обработке с префиксом проекта
             loggers.error(
-                text=f"Ошибка обработки: {str(e)}",
+                "Ошибка обработки: {}", e,
                 log_type=prefixed_log_type,
                 user=user_str
             )
@@ -154,19 +159,21 @@ class LoggingMiddleware(BaseMiddleware):
     def _determine_event_type(
             self,
             event: TelegramObject
-    ) -> Tuple[str, str, Optional[Message]]:
+    ) -> Tuple[str, Tuple[Any, ...], Optional[Message], Optional[User]]:
         """
-        Определяет тип события и извлекает информацию для логирования.
+        Определяет тип события и извлекает информацию для логирования
+        за один проход, вместе с автором события.
 
         Args:
             event: Объект события для анализа
 
         Returns:
-            Кортеж из (тип_лога, текст_лога, объект_сообщения)
+            Кортеж из (тип_лога, (шаблон_лога, *аргументы), объект_сообщения, пользователь)
         """
         log_type: str = "UPDATE"
-        log_text: str = f"Получен апдейт: {type(event).__name__}"
+        log_text: Tuple[Any, ...] = ("Получен апдейт: {}", type(event).__name__)
         message_obj: Optional[Message] = None
+        from_user: Optional[User] = None
 
         # Обработка Update объектов (основной тип в middleware)
         if isinstance(event, Update):
@@ -178,94 +185,61 @@ class LoggingMiddleware(BaseMiddleware):
                     event.edited_channel_post
             )
 
-            if message_obj and message_obj.text:
-                if self._is_command(message_obj.text):
-                    log_type: str = "CMD"
-                    log_text: str = f"использовал команду '{message_obj.text}'"
+            if message_obj:
+                from_user = message_obj.from_user
+                if message_obj.text:
+                    if self._is_command(message_obj.text):
+                        log_type: str = "CMD"
+                        log_text = ("использовал команду '{}'", message_obj.text)
+                    else:
+                        log_type: str = "MSG"
+                        log_text = ("получено сообщение: {!r}", message_obj.text)
                 else:
+                    # Не текстовое сообщение (фото, видео и т.д.)
                     log_type: str = "MSG"
-                    log_text: str = f"получено сообщение: {message_obj.text!r}"
-            elif message_obj:
-                # Не текстовое сообщение (фото, видео и т.д.)
-                log_type: str = "MSG"
-                log_text: str = f"получено сообщение: '{type_msg(message_obj)}'"
+                    log_text = ("получено сообщение: '{}'", type_msg(message_obj))
             elif event.callback_query:
-                # Обработка callback query
+                # Обработка callback query (автор — нажавший кнопку, а не автор сообщения)
                 callback: CallbackQuery = event.callback_query
+                from_user = callback.from_user
                 log_type: str = "CBD"
-                log_text: str = f"получен callback: {callback.data!r}"
+                log_text = ("получен callback: {!r}", callback.data)
                 if callback.message:
                     message_obj: Optional[MaybeInaccessibleMessageUnion] = callback.message
 
         # Прямая обработка Message (если мидлварь зарегистрирован на messages)
         elif isinstance(event, Message):
             message_obj = event
+            from_user = event.from_user
             if event.text and self._is_command(event.text):
                 log_type: str = "CMD"
-                log_text: str = f"использовал команду '{event.text}'"
+                log_text = ("использовал команду '{}'", event.text)
             elif event.text:
                 log_type: str = "MSG"
-                log_text: str = f"получено сообщение: {event.text!r}"
+                log_text = ("получено сообщение: {!r}", event.text)
             else:
                 log_type: str = "MSG"
-                log_text: str = f"получено сообщение типа: {event.content_type}"
+                log_text = ("получено сообщение типа: {}", event.content_type)
 
         # Прямая обработка CallbackQuery (если мидлварь зарегистрирован на callbacks)
         elif isinstance(event, CallbackQuery):
+            from_user = event.from_user
             log_type: str = "CBD"
-            log_text: str = f"получен callback: {event.data!r}"
+            log_text = ("получен callback: {!r}", event.data)
             if event.message:
                 message_obj = event.message
 
-        return log_type, log_text, message_obj
+        return log_type, log_text, message_obj, from_user
 
     @staticmethod
-    def _extract_user_info(
-            event: TelegramObject,
-            message: Optional[Message] = None
-    ) -> str:
+    def _extract_user_info(from_user: Optional[User] = None) -> str:
         """
-        Извлекает информацию о пользователе из события.
+        Форматирует автора события, найденного в _determine_event_type.
 
         Args:
-            event: Объект события (Update, Message или CallbackQuery)
-            message: Объект Message (если уже определен)
+            from_user: Пользователь события или None для служебных апдейтов
 
         Returns:
             Строка с идентификатором пользователя в формате '@username' или 'id<user_id>'
         """
-        user_str: str = "@System"
-
-        # Для CallbackQuery извлекаем пользователя из самого callback'а
-        if isinstance(event, CallbackQuery) and hasattr(event, 'from_user') and event.from_user:
-            user = event.from_user
-            user_str: str = f"@{user.username}" if user.username else f"id{user.id}"
-
-        # Для Message извлекаем пользователя из сообщения
-        elif isinstance(event, Message) and hasattr(event, 'from_user') and event.from_user:
-            user = event.from_user
-            user_str: str = f"@{user.username}" if user.username else f"id{user.id}"
-
-        # Для Update с callback_query
-        elif (isinstance(event, Update) and
-              event.callback_query and
-              hasattr(event.callback_query, 'from_user') and
-              event.callback_query.from_user):
-            user = event.callback_query.from_user
-            user_str: str = f"@{user.username}" if user.username else f"id{user.id}"
-
-        # Для Update с сообщением
-        elif (isinstance(event, Update) and
-              (event.message or event.edited_message) and
-              hasattr(event.message or event.edited_message, 'from_user')):
-            msg = event.message or event.edited_message
-            if msg and msg.from_user:
-                user: Optional[User] = msg.from_user
-                user_str: str = f"@{user.username}" if user.username else f"id{user.id}"
-
-        # Если передан message объект
-        elif message and hasattr(message, 'from_user') and message.from_user:
-            user: Optional[User] = message.from_user
-            user_str: str = f"@{user.username}" if user.username else f"id{user.id}"
-
-        return user_str
\ No newline at end of file
+        return user_tag(from_user)
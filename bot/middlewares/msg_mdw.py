@@ -15,12 +15,9 @@ class MessageCounterMiddleware(BaseMiddleware):
     async def __call__(
         self,
         handler: Callable[[Message, Dict[str, Any]], Awaitable[Any]],
-        event: Any,
+        event: Message,
         data: Dict[str, Any]
     ) -> Any:
-        if not isinstance(event, Message):
-            return await handler(event, data)
-
         # Проверяем, что сообщение пришло из группового чата и не от бота
         if (event.chat.type in (ChatType.GROUP, ChatType.SUPERGROUP) and 
             not event.from_user.is_bot):
@@ -34,22 +31,13 @@ class MessageCounterMiddleware(BaseMiddleware):
     @staticmethod
     async def process_group_message(message: Message) -> None:
         """
-        Обработка сообщения из группового чата.
+        Обработка сообщения из группового чата: запись ставится в очередь БД,
+        которая сохраняет сообщения и их авторов пачками в фоне.
         """
-        user_id = message.from_user.id
-        message_text = message.text or message.caption or ""
-
-        # Добавляем пользователя (если его ещё нет)
-        await db.add_user(
-            user_id=user_id,
-            username=message.from_user.username,
-            full_name=message.from_user.full_name,
-        )
-
-        # Сохраняем сообщение
         await db.add_message(
-            user_id=user_id,
-            message_text=message_text,
+            user_id=message.from_user.id,
+            message_text=message.text or message.caption or "",
             created_at=message.date,
+            username=message.from_user.username,
+            full_name=message.from_user.full_name,
         )
-        logger.info(f"Сообщение от пользователя {user_id} сохранено в БД")
@@ -1,10 +1,10 @@
-from typing import Callable, Awaitable, Any, Dict
+from typing import Callable, Awaitable, Any, Dict, Tuple
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject, Message, CallbackQuery
-import time
-from collections import defaultdict
+from time import monotonic
 
 from middleware.loggers import loggers  # ваш логгер
+from bot.utils import user_tag
 
 
 class RateLimitMiddleware(BaseMiddleware):
@@ -27,43 +27,50 @@ class RateLimitMiddleware(BaseMiddleware):
         """
         self.rate_limit = rate_limit
         self.time_period = time_period
-        self.user_calls: Dict[int, list[float]] = defaultdict(list)
+        # user_id -> (запросов в прошлом окне, запросов в текущем окне, начало текущего окна)
+        self.buckets: Dict[int, Tuple[int, int, float]] = {}
+        # Раз в _gc_interval запросов удаляем пользователей, переставших писать
+        self._ops_since_gc: int = 0
+        self._gc_interval: int = 4096
         super().__init__()
 
     async def __call__(
             self,
             handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
-            event: TelegramObject,
+            event: Message | CallbackQuery,
             data: Dict[str, Any],
             log: bool = False,
     ) -> Any:
         """
         Проверяет rate limit перед обработкой запроса.
         """
-        # Пропускаем не-сообщения и не-колбэки
-        if not isinstance(event, (Message, CallbackQuery)):
-            return await handler(event, data)
-
         user_id: int = event.from_user.id
-        user_str: str = f"@{event.from_user.username}" if event.from_user.username else f"id{user_id}"
-        current_time: float = time.time()
+        user_str: str = user_tag(event.from_user)
+        current_time: float = monotonic()
+
+        prev, curr, window_start = self.buckets.get(user_id, (0, 0, current_time))
 
-        # Очищаем старые запросы
-        self.user_calls[user_id] = [
-            call_time for call_time in self.user_calls[user_id]
-            if current_time - call_time < self.time_period
-        ]
+        # Сдвигаем окно, если текущее уже закончилось
+        elapsed: float = current_time - window_start
+        if elapsed >= self.time_period:
+            prev = curr if elapsed < 2 * self.time_period else 0
+            curr = 0
+            window_start += self.time_period * (elapsed // self.time_period)
+            elapsed = current_time - window_start
+
+        # Оценка числа запросов за скользящее окно: прошлое окно учитывается пропорционально
+        estimated: float = prev * (1 - elapsed / self.time_period) + curr
 
         # Логируем текущее состояние rate limit
         if log:
             loggers.debug(
-                text=f"Rate limit: {len(self.user_calls[user_id])}/{self.rate_limit} за {self.time_period}сек",
+                text=f"Rate limit: {estimated:.1f}/{self.rate_limit} за {self.time_period}сек",
                 log_type="RATE_LIMIT_STATUS",
                 user=user_str
             )
 
-        # Проверяем текущий лимит
-        if len(self.user_calls[user_id]) >= self.rate_limit:
+        if estimated >= self.rate_limit:
+            self.buckets[user_id] = (prev, curr, window_start)
             # Логируем попытку спама
             if log:
                 loggers.warning(
@@ -86,7 +93,12 @@ class RateLimitMiddleware(BaseMiddleware):
             return None
 
         # Добавляем текущий запрос и продолжаем обработку
-        self.user_calls[user_id].append(current_time)
+        self.buckets[user_id] = (prev, curr + 1, window_start)
+
+        self._ops_since_gc += 1
+        if self._ops_since_gc >= self._gc_interval:
+            self._sweep(current_time)
+            self._ops_since_gc = 0
 
         loggers.debug(
             text=f"Запрос добавлен в rate limit",
@@ -94,4 +106,14 @@ class RateLimitMiddleware(BaseMiddleware):
             user=user_str
         )
 
-        return await handler(event, data)
\ No newline at end of file
+        return await handler(event, data)
+
+    def _sweep(self, current_time: float) -> None:
+        """
+        Удаляет счётчики пользователей, от которых не было запросов два окна подряд:
+        для них оба счётчика уже обнулились бы при следующем сдвиге окна.
+        """
+        expire_before: float = current_time - 2 * self.time_period
+        dead = [uid for uid, (_, _, start) in self.buckets.items() if start <= expire_before]
+        for uid in dead:
+            del self.buckets[uid]
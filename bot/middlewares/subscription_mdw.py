@@ -1,9 +1,30 @@
-from typing import Callable, Awaitable, Any, Dict
+from asyncio import gather
+from typing import Callable, Awaitable, Any, Dict, Final
 from aiogram import BaseMiddleware, Bot
-from aiogram.types import TelegramObject, Message, CallbackQuery
+from aiogram.types import TelegramObject, Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.exceptions import TelegramBadRequest
 
 from middleware.loggers import loggers  # ваш логгер
+from bot.utils import user_tag
+from bot.filters._membership_cache import get_member_cached, invalidate_member
+
+
+# Статусы участника, при которых подписка считается оформленной
+_SUBSCRIBED_STATUSES: Final[frozenset[str]] = frozenset({"member", "administrator", "creator"})
+
+# Предупреждение и кнопка "Я подписался" — общие для всех отказов
+_WARNING_TEXT: Final[str] = (
+    "📢 Для использования бота необходимо подписаться на наши каналы!\n\n"
+    "После подписки нажмите /start для продолжения."
+)
+_SUBSCRIPTION_KEYBOARD: Final[InlineKeyboardMarkup] = InlineKeyboardMarkup(
+    inline_keyboard=[[
+        InlineKeyboardButton(
+            text="✅ Я подписался",
+            callback_data="check_subscription"
+        )
+    ]]
+)
 
 
 class SubscriptionMiddleware(BaseMiddleware):
@@ -27,23 +48,21 @@ class SubscriptionMiddleware(BaseMiddleware):
         """
         self.bot = bot
         self.channel_ids = channel_ids
+        # Время жизни статуса участника в общем кэше (ограничен по размеру, сбрасывается по ChatMemberUpdated)
+        self._ttl: float = 300.0
         super().__init__()
 
     async def __call__(
             self,
             handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
-            event: TelegramObject,
+            event: Message | CallbackQuery,
             data: Dict[str, Any]
     ) -> Any:
         """
         Проверяет подписку пользователя перед обработкой команды.
         """
-        # Пропускаем не-сообщения и не-колбэки
-        if not isinstance(event, (Message, CallbackQuery)):
-            return await handler(event, data)
-
         user_id: int = event.from_user.id
-        user_str: str = f"@{event.from_user.username}" if event.from_user.username else f"id{user_id}"
+        user_str: str = user_tag(event.from_user)
 
         # Логируем начало проверки подписки
         loggers.info(
@@ -52,25 +71,35 @@ class SubscriptionMiddleware(BaseMiddleware):
             user=user_str
         )
 
+        # Кнопка "Я подписался" должна видеть свежий статус, а не закэшированный
+        if isinstance(event, CallbackQuery) and event.data == "check_subscription":
+            for channel_id in self.channel_ids:
+                invalidate_member(channel_id, user_id)
+
         # Проверяем подписку на все required каналы
         not_subscribed_channels: list[str] = []
 
-        for channel_id in self.channel_ids:
-            try:
-                member = await self.bot.get_chat_member(
-                    chat_id=channel_id,
-                    user_id=user_id
-                )
-                # Проверяем, что пользователь является участником
-                if member.status not in ['member', 'administrator', 'creator']:
-                    not_subscribed_channels.append(str(channel_id))
+        # Каналы проверяем параллельно: задержка — max(RTT), а не их сумма;
+        # попадания в кэш участников возвращаются без запроса, одновременные промахи разделяют один HTTP-запрос
+        results = await gather(
+            *(get_member_cached(self.bot, channel_id, user_id, ttl=self._ttl) for channel_id in self.channel_ids),
+            return_exceptions=True,
+        )
 
-            except TelegramBadRequest as e:
+        for channel_id, member in zip(self.channel_ids, results):
+            if isinstance(member, TelegramBadRequest):
                 loggers.error(
-                    text=f"Ошибка проверки подписки на канал {channel_id}: {e}",
+                    text=f"Ошибка проверки подписки на канал {channel_id}: {member}",
                     log_type="SUBSCRIPTION_ERROR",
                     user=user_str
                 )
+                continue
+            if isinstance(member, BaseException):
+                raise member
+
+            # Проверяем, что пользователь является участником
+            if member.status not in _SUBSCRIBED_STATUSES:
+                not_subscribed_channels.append(str(channel_id))
 
         # Если пользователь не подписан на некоторые каналы
         if not_subscribed_channels:
@@ -80,26 +109,10 @@ class SubscriptionMiddleware(BaseMiddleware):
                 user=user_str
             )
 
-            warning_text = (
-                "📢 Для использования бота необходимо подписаться на наши каналы!\n\n"
-                "После подписки нажмите /start для продолжения."
-            )
-
-            # Создаем кнопку "Проверить подписку"
-            from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-            keyboard = InlineKeyboardMarkup(
-                inline_keyboard=[[
-                    InlineKeyboardButton(
-                        text="✅ Я подписался",
-                        callback_data="check_subscription"
-                    )
-                ]]
-            )
-
             if isinstance(event, Message):
-                await event.answer(warning_text, reply_markup=keyboard)
+                await event.answer(_WARNING_TEXT, reply_markup=_SUBSCRIPTION_KEYBOARD)
             elif isinstance(event, CallbackQuery):
-                await event.message.answer(warning_text, reply_markup=keyboard)
+                await event.message.answer(_WARNING_TEXT, reply_markup=_SUBSCRIPTION_KEYBOARD)
                 await event.answer()
 
             return None
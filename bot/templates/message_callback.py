@@ -1,20 +1,23 @@
 from typing import Union
 
-from aiogram.types import FSInputFile, CallbackQuery, Message, ReplyKeyboardMarkup, InlineKeyboardMarkup
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import CallbackQuery, Message, ReplyKeyboardMarkup, InlineKeyboardMarkup
 from aiogram.utils.keyboard import ReplyKeyboardBuilder, InlineKeyboardBuilder
 
+from bot.utils.file_cache import cached_photo, remember_photo, forget_photo
+
 # Настройка экспорта
 __all__ = ('msg', 'msg_photo')
 
 
 async def msg(message: Message | CallbackQuery,
               text: str = "Сообщение отправлено!",
-              markup: Union[InlineKeyboardBuilder, ReplyKeyboardBuilder, None] = None) -> None:
+              markup: Union[InlineKeyboardBuilder, ReplyKeyboardBuilder, InlineKeyboardMarkup, ReplyKeyboardMarkup, None] = None) -> None:
     """
     Шаблон для ответа на сообщение текстом.
     :param message: Объект сообщения или callback-запроса.
     :param text: Текст отправного сообщения от бота.
-    :param markup: Кнопки сообщения (инлайн или реплай).
+    :param markup: Кнопки сообщения (инлайн или реплай), билдер или готовая разметка.
     """
 
     # Преобразуем клавиатуру
@@ -24,6 +27,9 @@ async def msg(message: Message | CallbackQuery,
             reply_markup: InlineKeyboardMarkup = markup.as_markup()
         elif isinstance(markup, ReplyKeyboardBuilder):
             reply_markup: ReplyKeyboardMarkup = markup.as_markup(resize_keyboard=True)
+        else:
+            # Готовая (например, заранее собранная) разметка передаётся как есть
+            reply_markup = markup
 
     # Обработчик ответа на сообщение
     if isinstance(message, Message):
@@ -43,13 +49,14 @@ async def msg_photo(
     message: Message | CallbackQuery,
     text: str = "Сообщение отправлено!",
     file: str = "assets/default.jpg",
-    markup: Union[InlineKeyboardBuilder, ReplyKeyboardBuilder, None] = None) -> None:
+    markup: Union[InlineKeyboardBuilder, ReplyKeyboardBuilder, InlineKeyboardMarkup, ReplyKeyboardMarkup, None] = None) -> None:
     """
     Шаблон для ответа на сообщение фотографией.
+    Фото загружается один раз, затем переиспользуется его file_id.
     :param message: Объект сообщения или callback-запроса.
     :param file: Путь к фотографии для ответа.
     :param text: Подпись к фото.
-    :param markup: Кнопки сообщения (инлайн или реплай).
+    :param markup: Кнопки сообщения (инлайн или реплай), билдер или готовая разметка.
     """
 
     # Преобразуем клавиатуру
@@ -59,19 +66,27 @@ async def msg_photo(
             reply_markup = markup.as_markup()
         elif isinstance(markup, ReplyKeyboardBuilder):
             reply_markup = markup.as_markup(resize_keyboard=True)
+        else:
+            # Готовая (например, заранее собранная) разметка передаётся как есть
+            reply_markup = markup
 
-    # Обработчик ответа на сообщение
-    if isinstance(message, Message):
-        await message.reply_photo(
-            photo=FSInputFile(file),
+    # Обработчик ответа на сообщение или callback
+    target: Message = message if isinstance(message, Message) else message.message
+
+    # После первой загрузки фото отправляется по file_id, без повторной выгрузки файла
+    try:
+        sent: Message = await target.reply_photo(
+            photo=cached_photo(file),
             caption=text,
             reply_markup=reply_markup
         )
-
-    # Обработчик ответа на callback
-    else:
-        await message.message.reply_photo(
-            photo=FSInputFile(file),
+    except TelegramBadRequest:
+        # Устаревший file_id — сбрасываем и загружаем файл заново
+        if not forget_photo(file):
+            raise
+        sent = await target.reply_photo(
+            photo=cached_photo(file),
             caption=text,
             reply_markup=reply_markup
         )
+    remember_photo(file, sent)
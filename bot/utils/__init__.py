@@ -3,3 +3,4 @@ from .usernames import *
 from .pagination import *
 from .type_message import *
 from .argument import *
+from .file_cache import *
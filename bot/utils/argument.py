@@ -1,9 +1,38 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Final, Optional
 from configs import BotSettings
 
-__all__ = ("is_command", "find_argument")
+__all__ = ("is_command", "find_argument", "parse_command")
+
+
+# Каждый символ PREFIX — допустимый префикс команды (читаем настройки один раз)
+_PREFIXES: Final[tuple[str, ...]] = tuple(BotSettings.PREFIX)
+
+
+def parse_command(message: Optional[str]) -> tuple[bool, Optional[str]]:
+    """
+    Разбирает сообщение за один проход: команда ли это и какой у неё аргумент.
+
+    Args:
+        message (Optional[str]): Входное сообщение.
+
+    Returns:
+        tuple[bool, Optional[str]]: (является ли командой, аргумент или None).
+
+    Пример:
+        >>> parse_command("/start referrer")
+        (True, 'referrer')
+        >>> parse_command("hello")
+        (False, None)
+    """
+    if not message:
+        return False, None
+    stripped = message.strip()
+    if not stripped.startswith(_PREFIXES):
+        return False, None
+    parts = stripped.split(maxsplit=1)
+    return True, (parts[1] if len(parts) > 1 else None)
 
 
 def is_command(message: Optional[str]) -> bool:
@@ -26,9 +55,7 @@ def is_command(message: Optional[str]) -> bool:
         >>> is_command("hello")
         False
     """
-    if not message:
-        return False
-    return message.strip().startswith(BotSettings.PREFIX)
+    return bool(message) and message.lstrip().startswith(_PREFIXES)
 
 
 def find_argument(message: Optional[str]) -> Optional[str]:
@@ -52,8 +79,4 @@ def find_argument(message: Optional[str]) -> Optional[str]:
         >>> find_argument("hello")
         None
     """
-    if not is_command(message):
-        return None
-
-    parts = message.strip().split(maxsplit=1)
-    return parts[1] if len(parts) > 1 else None
+    return parse_command(message)[1]
@@ -0,0 +1,41 @@
+from typing import Optional, Union
+
+from aiogram.types import FSInputFile, Message
+
+# Настройка экспорта в модули
+__all__ = ('cached_photo', 'remember_photo', 'forget_photo',)
+
+
+# Путь к файлу -> file_id, выданный Telegram после первой загрузки
+_FILE_IDS: dict[str, str] = {}
+
+
+def cached_photo(path: str) -> Union[str, FSInputFile]:
+    """
+    Возвращает file_id ранее загруженного фото или файл для первой загрузки.
+
+    :param path: Путь к фотографии.
+    :return: Строка file_id или FSInputFile.
+    """
+    return _FILE_IDS.get(path) or FSInputFile(path)
+
+
+def remember_photo(path: str, sent: Optional[Message]) -> None:
+    """
+    Запоминает file_id самой большой версии отправленного фото.
+
+    :param path: Путь к фотографии.
+    :param sent: Сообщение, которое вернул Telegram после отправки.
+    """
+    if path not in _FILE_IDS and sent is not None and sent.photo:
+        _FILE_IDS[path] = sent.photo[-1].file_id
+
+
+def forget_photo(path: str) -> bool:
+    """
+    Сбрасывает закэшированный file_id (например, если Telegram его отклонил).
+
+    :param path: Путь к фотографии.
+    :return: True, если запись была в кэше.
+    """
+    return _FILE_IDS.pop(path, None) is not None
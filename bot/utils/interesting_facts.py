@@ -1,12 +1,32 @@
 from random import choice
+from typing import Optional
 
 from configs.config import Lists
 
 # Настройки экспорта
-__all__ = ("interesting_fact",)
+__all__ = ("interesting_fact", "refresh_facts",)
 
 
-def interesting_fact(mode: str = "факт", lists: list[str] = None) -> str:
+# Источники по режиму, собранные один раз в неизменяемые кортежи
+_SOURCES: dict[str, tuple[str, ...]] = {}
+_FACTS: tuple[str, ...] = ()
+
+
+def refresh_facts() -> None:
+    """
+    Пересобирает кортежи фактов, анекдотов и цитат из Lists.
+    Словарь подменяется целиком, поэтому одновременные вызовы видят согласованные данные.
+    """
+    global _SOURCES, _FACTS
+    _FACTS = tuple(Lists.facts)
+    _SOURCES = {
+        "анекдот": tuple(Lists.jokes),
+        "цитата": tuple(Lists.quotes),
+        "факт": _FACTS,
+    }
+
+
+def interesting_fact(mode: str = "факт", lists: Optional[list[str]] = None) -> str:
     """
     Возвращает случайный факт, анекдот или цитату, в зависимости от режима.
 
@@ -17,13 +37,8 @@ def interesting_fact(mode: str = "факт", lists: list[str] = None) -> str:
     if lists is not None:
         return choice(lists)
 
-    mode: str = mode.lower()
+    return choice(_SOURCES.get(mode.lower(), _FACTS))
 
-    if mode == "анекдот":
-        source: list[str] = Lists.jokes
-    elif mode == "цитата":
-        source: list[str] = Lists.quotes
-    else:
-        source: list[str] = Lists.facts
 
-    return choice(source)
+# Предварительная сборка при импорте
+refresh_facts()
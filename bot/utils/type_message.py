@@ -65,6 +65,10 @@ CONTENT_TYPE_RU: Final[dict[str, str]] = {
     "message_reaction": "Реакция на сообщение",
 }
 
+# Связанные методы поиска — без поиска глобального имени и атрибута .get на каждый вызов
+_TYPE_CHAT_GET = CHAT_TYPES.get
+_TYPE_MSG_GET = CONTENT_TYPE_RU.get
+
 
 def type_msg(message: Message) -> str:
     """
@@ -73,7 +77,8 @@ def type_msg(message: Message) -> str:
     :param message: объект Message от aiogram
     :return: строка с типом сообщения
     """
-    return CONTENT_TYPE_RU.get(message.content_type, f"Неизвестный тип ({message.content_type})")
+    content_type = message.content_type
+    return _TYPE_MSG_GET(content_type) or f"Неизвестный тип ({content_type})"
 
 def type_chat(message: Message) -> str:
     """
@@ -82,4 +87,5 @@ def type_chat(message: Message) -> str:
     :param message: Объект сообщения из aiogram, содержащий информацию о чате.
     :return: Тип чата строкой.
     """
-    return CHAT_TYPES.get(message.chat.type, f"Неизвестный тип чата {message.chat.type}")
+    chat_type = message.chat.type
+    return _TYPE_CHAT_GET(chat_type) or f"Неизвестный тип чата {chat_type}"
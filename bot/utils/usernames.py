@@ -1,7 +1,10 @@
-from aiogram.types import Message
+from functools import lru_cache
+from typing import Optional
+
+from aiogram.types import Message, User
 
 # Настройка экспорта в модули
-__all__ = ('username', )
+__all__ = ('username', 'user_tag', )
 
 # Функция получения юзера или ID пользователя
 def username(message: Message) -> str:
@@ -19,3 +22,22 @@ def username(message: Message) -> str:
 
     except ValueError as e:
         raise e  # Перебрасываем ошибку выше для дальнейшей обработки
+
+
+@lru_cache(maxsize=4096)
+def _tag(user_id: int, user_name: Optional[str]) -> str:
+    return f"@{user_name}" if user_name else f"id{user_id}"
+
+
+# Функция получения метки пользователя для логов
+def user_tag(user: Optional[User]) -> str:
+    """
+    Возвращает метку пользователя для логов: '@username' или 'id<user_id>'.
+    Строки кэшируются — юзернеймы меняются редко.
+
+    :param user: Пользователь aiogram или None для служебных событий.
+    :return: Метка пользователя, для None — '@System'.
+    """
+    if user is None:
+        return "@System"
+    return _tag(user.id, user.username)
@@ -57,12 +57,24 @@ class Settings(BaseSettings):
     LOG_FILE_INFO: Path = Path('bot_info.log')
 
     # Вебхук
-    WEBHOOK: bool = False
+    WEBHOOK: bool = True  # False — long polling (для локальной разработки)
     WEBHOOK_URL: str = "https://bot.primo.dpdns.org/webhook"  # публичный HTTPS url
     WEBAPP_HOST: str = "0.0.0.0"  # адрес, на котором слушает uvicorn внутри контейнера
     WEBAPP_PORT: int = 3131
     LOG_LEVEL: str = "warning"
     ACCES_LOG: bool = False
+    MAX_CONNECTIONS: int = 100  # параллельные HTTPS-соединения Telegram к вебхуку (1-100)
+    ALLOWED_UPDATES: list[str] = []  # пусто — вычисляется по подключённым роутерам
+    MAX_INFLIGHT: int = 256  # апдейтов в обработке одновременно, сверх — ответ 429
+
+    # Хранилище FSM
+    REDIS_URL: Optional[str] = None  # пусто — MemoryStorage (локальная разработка)
+    FSM_TTL: int = 3600  # время жизни состояний и данных FSM в Redis (сек)
+
+    # HTTP-сессия Bot API
+    HTTP_POOL_LIMIT: int = 512  # одновременных соединений к api.telegram.org
+    HTTP_TIMEOUT: float = 30.0  # таймаут запроса к Bot API (сек)
+    HTTP_KEEPALIVE: float = 90.0  # время жизни простаивающего соединения (сек)
 
     # API ключи
     API_KEY: Optional[str] = None
@@ -150,6 +162,13 @@ class Settings(BaseSettings):
             raise ValueError("ID не может быть отрицательным")
         return v
 
+    @field_validator('MAX_CONNECTIONS')
+    def validate_max_connections(cls, v: int) -> int:
+        """Проверка лимита соединений вебхука (ограничение Telegram API)"""
+        if not (1 <= v <= 100):
+            raise ValueError("MAX_CONNECTIONS должен быть от 1 до 100")
+        return v
+
     @field_validator('WEBHOOK_URL')
     def validate_webhook_url(cls, v: str) -> str:
         """Базовая проверка URL вебхука"""
@@ -258,6 +277,11 @@ class BotSettings:
     LINK_PREVIEW_PREFER_LARGE_MEDIA: Final[bool] = settings.LINK_PREVIEW_PREFER_LARGE_MEDIA
     LINK_PREVIEW_SHOW_ABOVE_TEXT: Final[bool] = settings.LINK_PREVIEW_SHOW_ABOVE_TEXT
     SHOW_CAPTION_ABOVE_MEDIA: Final[bool] = settings.SHOW_CAPTION_ABOVE_MEDIA
+    REDIS_URL: Final[Optional[str]] = settings.REDIS_URL
+    FSM_TTL: Final[int] = settings.FSM_TTL
+    HTTP_POOL_LIMIT: Final[int] = settings.HTTP_POOL_LIMIT
+    HTTP_TIMEOUT: Final[float] = settings.HTTP_TIMEOUT
+    HTTP_KEEPALIVE: Final[float] = settings.HTTP_KEEPALIVE
 
 
 class Permission:
@@ -285,6 +309,9 @@ class Webhook:
     WEBAPP_PORT: Final[int] = settings.WEBAPP_PORT
     LOG_LEVEL: Final[str] = settings.LOG_LEVEL
     ACCES_LOG: Final[bool] = settings.ACCES_LOG
+    MAX_CONNECTIONS: Final[int] = settings.MAX_CONNECTIONS
+    ALLOWED_UPDATES: Final[list[str]] = settings.ALLOWED_UPDATES
+    MAX_INFLIGHT: Final[int] = settings.MAX_INFLIGHT
 
 
 
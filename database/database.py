@@ -1,8 +1,14 @@
 from __future__ import annotations
 
 import enum
+import logging
+import re
+from asyncio import Future, Queue, QueueEmpty, Task, create_task, gather, get_running_loop, sleep
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Tuple, List, Protocol, runtime_checkable, Dict, Any, Union
+from functools import lru_cache
+from time import time
+from typing import Optional, Tuple, List, Protocol, runtime_checkable, Dict, Any, Union, Callable, Awaitable, Iterable
 
 from sqlalchemy import (
     BigInteger,
@@ -13,10 +19,17 @@ from sqlalchemy import (
     Enum as SAEnum,
     func,
     select,
-    and_,
     Integer, case,
+    Index,
+    insert,
+    event,
+    lambda_stmt,
+    update,
+    bindparam,
+    exists,
 )
 from sqlalchemy import text as sql_text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.engine import Result
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -31,6 +44,9 @@ from sqlalchemy.orm import (
     relationship,
 )
 from sqlalchemy.sql import Select
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+logger = logging.getLogger(__name__)
 
 __all__: Tuple[str, ...] = (
     "UserStatus",
@@ -38,6 +54,7 @@ __all__: Tuple[str, ...] = (
     "UserMessage",
     "Role",
     "RoleRegion",
+    "HSR_REGIONS",
     "RoleMessage",
     "BotDatabase",
     "db"
@@ -126,6 +143,32 @@ class RoleRegion(str, enum.Enum):
     HSR_FATE = "Фейт"
 
 
+# Регионы Honkai: Star Rail — по ним роль относится к сообщению 'hsr', остальные к 'genshin'
+HSR_REGIONS: frozenset[RoleRegion] = frozenset(r for r in RoleRegion if r.name.startswith("HSR_"))
+
+
+# UTC-зона и текущее время для значений по умолчанию (без поиска timezone.utc на каждый вызов)
+_UTC: timezone = timezone.utc
+
+
+def _utcnow() -> datetime:
+    """Текущее время в UTC (tz-aware)."""
+    return datetime.now(_UTC)
+
+
+def _game_type(region: RoleRegion) -> str:
+    """
+    Тип игры для сообщения со списком ролей по региону роли.
+
+    Args:
+        region: регион роли.
+
+    Returns:
+        str: 'hsr' или 'genshin'.
+    """
+    return "hsr" if region in HSR_REGIONS else "genshin"
+
+
 # ======================================================
 # Протоколы для минимальной типизации aiogram-сообщений
 # (чтобы не тянуть aiogram как зависимость, но иметь строгие типы)
@@ -202,13 +245,13 @@ class User(Base):
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        default=_utcnow,
         nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        default=_utcnow,
+        onupdate=_utcnow,
         nullable=False,
     )
 
@@ -245,6 +288,9 @@ class UserMessage(Base):
     """
 
     __tablename__: str = "user_messages"
+    __table_args__ = (
+        Index("ix_user_messages_user_id_created_at", "user_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     user_id: Mapped[int] = mapped_column(
@@ -255,7 +301,7 @@ class UserMessage(Base):
     message_text: Mapped[str] = mapped_column(Text, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        default=_utcnow,
         nullable=False
     )
 
@@ -275,6 +321,7 @@ class Role(Base):
         region (RoleRegion) - Регион персонажа
         occupied_by (Optional[int]) - Пользователь, который занимает роль (FK -> users.id)
         occupied_by_user (Optional[User]) - Обратная связь на пользователя
+        game_type (str) - Тип игры по региону: 'hsr' или 'genshin' (вычисляется, не хранится)
 
     Ограничения:
         - Уникальность name
@@ -302,6 +349,11 @@ class Role(Base):
         back_populates="roles"
     )
 
+    @property
+    def game_type(self) -> str:
+        """Тип игры роли: 'hsr' или 'genshin'."""
+        return _game_type(self.region)
+
 
 class RoleMessage(Base):
     """
@@ -317,6 +369,9 @@ class RoleMessage(Base):
         message_id (int) - ID сообщения
         message_text (str) - исходный текст сообщения
 
+    Индексы:
+        - ix_role_messages_game_type (game_type, уникальный)
+
     Пример:
         >> role_msg = RoleMessage(
         >>     game_type="genshin",
@@ -326,6 +381,9 @@ class RoleMessage(Base):
         >> )
     """
     __tablename__: str = "role_messages"
+    __table_args__ = (
+        Index("ix_role_messages_game_type", "game_type", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     game_type: Mapped[str] = mapped_column(String, nullable=False)  # 'genshin' или 'hsr'
@@ -389,6 +447,173 @@ def _start_of_month(dt: datetime) -> datetime:
     return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
 
+# ======================================================
+# Заранее собранные запросы (SQL компилируется один раз)
+# ======================================================
+def _role_by_name_stmt(role_name: str) -> StatementLambdaElement:
+    """
+    Запрос роли по имени. SQL компилируется один раз, имя подставляется параметром.
+
+    Args:
+        role_name: название роли.
+
+    Returns:
+        StatementLambdaElement: готовый к выполнению запрос.
+    """
+    return lambda_stmt(lambda: select(Role).where(Role.name == role_name))
+
+
+# Статистика сообщений пользователя: (за день, за неделю, за месяц, всего).
+# Собирается один раз, границы периодов и ID подставляются параметрами.
+_MESSAGE_STATS_STMT: Select[Tuple[Optional[int], Optional[int], Optional[int], int]] = select(
+    func.sum(case((UserMessage.created_at >= bindparam("day", type_=DateTime(timezone=True)), 1), else_=0)),
+    func.sum(case((UserMessage.created_at >= bindparam("week", type_=DateTime(timezone=True)), 1), else_=0)),
+    func.sum(case((UserMessage.created_at >= bindparam("month", type_=DateTime(timezone=True)), 1), else_=0)),
+    func.count(),
+).where(UserMessage.user_id == bindparam("uid"))
+
+# Вставка пользователей, которых ещё нет (существующие не трогаем)
+_INSERT_MISSING_USERS = sqlite_insert(User).on_conflict_do_nothing(index_elements=[User.id])
+# Вставка сообщений (одна строка или пачка через executemany)
+_INSERT_MESSAGES = insert(UserMessage)
+
+# Назначение свободной роли существующему незабаненному пользователю -> регион роли
+_ASSIGN_ROLE_STMT = (
+    update(Role)
+    .where(
+        Role.name == bindparam("role_name"),
+        Role.occupied_by.is_(None),
+        exists().where(User.id == bindparam("uid"), User.status != UserStatus.BANNED),
+    )
+    .values(occupied_by=bindparam("uid"))
+    .returning(Role.region)
+)
+# Освобождение занятой роли -> регион роли
+_RELEASE_ROLE_STMT = (
+    update(Role)
+    .where(Role.name == bindparam("role_name"), Role.occupied_by.is_not(None))
+    .values(occupied_by=None)
+    .returning(Role.region)
+)
+
+
+# ======================================================
+# Разбор сообщения со списком ролей
+# ======================================================
+# Строки-заголовки, которые не трогаем
+_ROLE_HEADER_RE: re.Pattern[str] = re.compile(r"ᵎ|СПИСОК|Если персонажа")
+# Отметки статуса роли, удаляемые перед сравнением с именем
+_ROLE_MARKERS_DELETE: Dict[int, None] = str.maketrans("", "", "✅🕒")
+# Маркер отсутствующей в базе роли (None — это «роль свободна»)
+_ROLE_MISSING: Any = object()
+
+
+def _rewrite_role_line(line: str, get_status: Any) -> str:
+    """
+    Проставляет отметку статуса в одной строке сообщения со списком ролей.
+
+    Args:
+        line: строка сообщения.
+        get_status: метод get словаря {имя роли: id занявшего или None}.
+
+    Returns:
+        str: строка с актуальной отметкой или исходная строка.
+    """
+    # Пропускаем заголовки и пустые строки
+    if not line.strip() or _ROLE_HEADER_RE.search(line):
+        return line
+
+    role_name: str = line.translate(_ROLE_MARKERS_DELETE).strip()
+    occupied_by: Any = get_status(role_name, _ROLE_MISSING)
+    if occupied_by is _ROLE_MISSING:
+        # Роль не найдена в базе - оставляем как есть
+        return line
+    # Занятой роли — галочка, свободная остаётся без отметок
+    return f"{role_name} ✅" if occupied_by is not None else role_name
+
+
+def _rewrite_role_text(message_text: str, status: Dict[str, Optional[int]]) -> str:
+    """
+    Обновляет отметки ролей во всём тексте сообщения одним проходом.
+
+    Args:
+        message_text: текущий текст сообщения.
+        status: словарь {имя роли: id занявшего или None}.
+
+    Returns:
+        str: обновлённый текст.
+    """
+    get_status = status.get
+    return "\n".join([_rewrite_role_line(line, get_status) for line in message_text.split("\n")])
+
+
+# ======================================================
+# Настройка соединений SQLite
+# ======================================================
+# Применяются один раз на каждое новое соединение пула
+_SQLITE_PRAGMAS: Tuple[str, ...] = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
+)
+
+
+def _create_missing_indexes(connection: Any) -> None:
+    """
+    Создаёт объявленные в моделях индексы, которых ещё нет в базе.
+
+    Args:
+        connection: синхронное соединение (вызывается через run_sync).
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+def _create_schema(connection: Any) -> None:
+    """
+    Создаёт недостающие таблицы и индексы.
+
+    Args:
+        connection: синхронное соединение (вызывается через run_sync).
+    """
+    Base.metadata.create_all(connection)
+    # create_all не добавляет индексы в уже существующие таблицы
+    _create_missing_indexes(connection)
+
+
+def _apply_sqlite_pragmas(dbapi_connection: Any, _connection_record: Any) -> None:
+    """
+    Настраивает соединение SQLite: WAL, отложенный fsync и кэш страниц в памяти.
+
+    Args:
+        dbapi_connection: DBAPI-соединение, созданное пулом.
+        _connection_record: запись пула (не используется).
+    """
+    cursor = dbapi_connection.cursor()
+    for pragma in _SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+@lru_cache(maxsize=4)
+def _period_starts(minute_bucket: int) -> Tuple[datetime, datetime, datetime]:
+    """
+    Начала текущих дня, недели и месяца (UTC) для минуты с номером minute_bucket.
+    Границы периодов кратны минуте, поэтому в пределах минуты результат не меняется.
+
+    Args:
+        minute_bucket: номер минуты от начала эпохи (int(time()) // 60).
+
+    Returns:
+        Tuple[datetime, datetime, datetime]: (начало дня, начало недели, начало месяца).
+    """
+    now: datetime = datetime.fromtimestamp(minute_bucket * 60, _UTC)
+    return _start_of_day(now), _start_of_week_monday(now), _start_of_month(now)
+
+
 # ======================================================
 # Класс управления базой данных
 # ======================================================
@@ -422,6 +647,17 @@ class BotDatabase:
     """
 
     DEFAULT_DB_URL: str = "sqlite+aiosqlite:///./bot.db"
+    # Максимум сообщений в одной транзакции и пауза между сбросами очереди (сек)
+    MESSAGE_BATCH_SIZE: int = 500
+    MESSAGE_FLUSH_INTERVAL: float = 0.2
+    # Сколько раз повторять запись пачки после ошибки, прежде чем её отбросить
+    MESSAGE_WRITE_RETRIES: int = 3
+    # Сколько недавних авторов помнить, чтобы не перепроверять их наличие в БД
+    KNOWN_USERS_MAX: int = 10_000
+    # Сколько секунд соединение SQLite ждёт снятия блокировки, прежде чем вернуть "database is locked"
+    SQLITE_BUSY_TIMEOUT: float = 30.0
+    # Окно (сек), за которое одиночные изменения пользователей собираются в одну транзакцию
+    WRITE_COALESCE_INTERVAL: float = 0.005
 
     def __init__(self, db_url: Optional[str] = None, echo: bool = False) -> None:
         """
@@ -442,11 +678,49 @@ class BotDatabase:
             raise ValueError("db_url не может быть пустой строкой")
 
         url: str = db_url or self.DEFAULT_DB_URL
-        self.engine: AsyncEngine = create_async_engine(url, echo=echo, future=True)
+        # Файловой базе — постоянный пул: соединения и их кэш страниц переживают запросы
+        # (in-memory база живёт в единственном соединении, ей пул не настраивается)
+        file_sqlite: bool = url.startswith("sqlite") and ":memory:" not in url
+        engine_kwargs: Dict[str, Any] = {}
+        if file_sqlite:
+            engine_kwargs.update(pool_size=8, max_overflow=0, connect_args={"timeout": self.SQLITE_BUSY_TIMEOUT})
+
+        self.engine: AsyncEngine = create_async_engine(url, echo=echo, future=True, **engine_kwargs)
+        # SQLite допускает одного писателя: записи получают своё единственное соединение
+        # и ждут очереди в пуле, а не упираются в блокировку файла (чтения в WAL идут параллельно)
+        self.write_engine: AsyncEngine = self.engine
+        if file_sqlite:
+            self.write_engine = create_async_engine(
+                url, echo=echo, future=True, pool_size=1, max_overflow=0,
+                connect_args={"timeout": self.SQLITE_BUSY_TIMEOUT},
+            )
+        if self.engine.dialect.name == "sqlite":
+            event.listen(self.engine.sync_engine, "connect", _apply_sqlite_pragmas)
+            if self.write_engine is not self.engine:
+                event.listen(self.write_engine.sync_engine, "connect", _apply_sqlite_pragmas)
         self.session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
-            bind=self.engine, expire_on_commit=False, class_=AsyncSession
+            bind=self.write_engine, expire_on_commit=False, class_=AsyncSession
+        )
+        # Сессии только для чтения: без autoflush перед каждым запросом
+        self._read_session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
+            bind=self.engine, expire_on_commit=False, autoflush=False, class_=AsyncSession
         )
 
+        # Очередь сообщений: add_message только ставит запись, фоновая задача пишет пачками
+        self._msg_queue: Queue[Tuple[int, Optional[str], Optional[str], str, Optional[datetime]]] = Queue()
+        self._writer_task: Optional[Task] = None
+        # Изменения пользователей, ждущие общей транзакции: (операция, future вызывающего)
+        self._write_ops: List[Tuple[Callable[[AsyncSession], Awaitable[Any]], Future]] = []
+        self._write_task: Optional[Task] = None
+        # user_id -> (username, full_name) авторов, уже записанных в БД
+        self._known_users: OrderedDict[int, Tuple[Optional[str], Optional[str]]] = OrderedDict()
+        # Статус ролей (имя -> user_id | None); сбрасывается при каждом изменении ролей
+        self._role_status_cache: Optional[Dict[str, Optional[int]]] = None
+        # Поколение кэша ролей: растёт при каждом сбросе, чтобы устаревшее чтение не попало в кэш
+        self._role_status_gen: int = 0
+        # game_type -> (channel_id, message_id, исходный текст) сообщения со списком ролей
+        self._role_msg_cache: Dict[str, Tuple[int, int, str]] = {}
+
     # ----------------------- Инициализация схемы -----------------------
     async def init_db(self) -> None:
         """
@@ -455,18 +729,110 @@ class BotDatabase:
         Пример:
             >> await db.init_db()
         """
-        async with self.engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+        async with self.write_engine.begin() as conn:
+            await conn.run_sync(_create_schema)
+        self._ensure_writer()
+
+    async def startup(self) -> bool:
+        """
+        Подготавливает БД к запуску бота: проверка соединения, схема и стандартные роли.
+        Всё выполняется через одно соединение записи, без отдельных подключений на каждый шаг.
+        SQLite при этом однократно проверяется через PRAGMA quick_check.
+
+        Returns:
+            bool: True если база готова, False если подключиться не удалось или база повреждена.
+
+        Пример:
+            >> if not await db.startup():
+            >>     print("Не удалось подключиться к БД!")
+        """
+        try:
+            async with self.write_engine.begin() as conn:
+                if conn.dialect.name == "sqlite":
+                    # Разовая проверка целостности вместо пинга при каждом запросе
+                    check: Optional[str] = (await conn.execute(sql_text("PRAGMA quick_check"))).scalar()
+                    if check != "ok":
+                        logger.error("БД не прошла PRAGMA quick_check: %s", check)
+                        return False
+                else:
+                    await conn.execute(sql_text("SELECT 1"))
+                await conn.run_sync(_create_schema)
+        except Exception:
+            logger.exception("Ошибка подключения к БД")
+            return False
+
+        self._ensure_writer()
+        await self.init_default_roles()
+        return True
 
     async def dispose(self) -> None:
         """
-        Корректно закрывает соединения с БД.
+        Дописывает очередь сообщений и корректно закрывает соединения с БД.
 
         Пример:
             >> await db.dispose()
         """
+        if self._writer_task is not None:
+            await self.flush()
+            self._writer_task.cancel()
+            self._writer_task = None
+        if self._write_task is not None:
+            await self._write_task
+        if self.write_engine is not self.engine:
+            await self.write_engine.dispose()
         await self.engine.dispose()
 
+    # ----------------------- Объединение записей -----------------------
+    async def _coalesced_write(self, op: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+        """
+        Ставит операцию в общую транзакцию и ждёт её фиксации.
+
+        Args:
+            op: корутинная функция, выполняющая запросы в переданной сессии.
+
+        Returns:
+            Any: результат op после commit.
+        """
+        future: Future = get_running_loop().create_future()
+        self._write_ops.append((op, future))
+        if self._write_task is None:
+            self._write_task = create_task(self._write_flusher())
+        return await future
+
+    async def _write_flusher(self) -> None:
+        """
+        Фоновая задача: раз в WRITE_COALESCE_INTERVAL выполняет накопленные операции
+        в одной сессии и фиксирует их одним commit.
+        """
+        try:
+            while self._write_ops:
+                await sleep(self.WRITE_COALESCE_INTERVAL)
+                ops, self._write_ops = self._write_ops, []
+                try:
+                    async with self.session_factory() as session:
+                        results: List[Any] = [await op(session) for op, _ in ops]
+                        await session.commit()
+                except Exception:
+                    # Одна операция сорвала пачку — повторяем по одной, чтобы ошибка досталась только её автору
+                    for op, future in ops:
+                        try:
+                            async with self.session_factory() as session:
+                                result: Any = await op(session)
+                                await session.commit()
+                        except Exception as e:
+                            if not future.done():
+                                future.set_exception(e)
+                        else:
+                            if not future.done():
+                                future.set_result(result)
+                    continue
+
+                for (_, future), result in zip(ops, results):
+                    if not future.done():
+                        future.set_result(result)
+        finally:
+            self._write_task = None
+
     # ----------------------- Пользователи -----------------------
     async def add_user(
             self,
@@ -487,19 +853,13 @@ class BotDatabase:
         Пример:
             >> await db.add_user(42, username="neo", full_name="Thomas Anderson", is_admin=True)
         """
+        status: UserStatus = UserStatus.ADMIN if is_admin else UserStatus.ACTIVE
         async with self.session_factory() as session:
-            existing: Optional[User] = await session.get(User, user_id)
-            if existing is not None:
-                return
-
-            status: UserStatus = UserStatus.ADMIN if is_admin else UserStatus.ACTIVE
-            new_user: User = User(
-                id=user_id,
-                username=username,
-                full_name=full_name,
-                status=status,
+            # Один атомарный INSERT ... ON CONFLICT DO NOTHING вместо SELECT + INSERT
+            await session.execute(
+                _INSERT_MISSING_USERS,
+                {"id": user_id, "username": username, "full_name": full_name, "status": status},
             )
-            session.add(new_user)
             await session.commit()
 
     async def ensure_user_from_message(self, message: SupportsAiogramMessage) -> None:
@@ -513,18 +873,19 @@ class BotDatabase:
             >> # в хендлере aiogram:
             >> await db.ensure_user_from_message(message)
         """
-        # Строгая проверка протокола:
-        if not isinstance(message, SupportsAiogramMessage):
-            raise TypeError("message не соответствует протоколу SupportsAiogramMessage")
-
-        from_user: SupportsUser = message.from_user
-        if not isinstance(from_user, SupportsUser):
-            raise TypeError("message.from_user не соответствует протоколу SupportsUser")
+        # Утиная типизация вместо isinstance по runtime-протоколу (тот проверяет каждый атрибут через hasattr)
+        try:
+            from_user: SupportsUser = message.from_user
+            user_id: int = from_user.id
+            username: Optional[str] = from_user.username
+            full_name: Optional[str] = from_user.full_name
+        except AttributeError as e:
+            raise TypeError("message не соответствует протоколу SupportsAiogramMessage") from e
 
         await self.add_user(
-            user_id=from_user.id,
-            username=from_user.username,
-            full_name=from_user.full_name,
+            user_id=user_id,
+            username=username,
+            full_name=full_name,
         )
 
     async def set_admin(self, user_id: int, make_admin: bool = True) -> None:
@@ -539,12 +900,12 @@ class BotDatabase:
             >> await db.set_admin(42, make_admin=True)   # Сделать админом
             >> await db.set_admin(42, make_admin=False)  # Убрать админа
         """
-        async with self.session_factory() as session:
-            user: Optional[User] = await session.get(User, user_id)
-            if user is None:
-                return
-            user.status = UserStatus.ADMIN if make_admin else UserStatus.ACTIVE
-            await session.commit()  # Убедитесь, что этот вызов есть!
+        stmt = (
+            update(User)
+            .where(User.id == user_id)
+            .values(status=UserStatus.ADMIN if make_admin else UserStatus.ACTIVE)
+        )
+        await self._coalesced_write(lambda session: session.execute(stmt))
 
     async def ban_user(self, user_id: int) -> None:
         """
@@ -556,12 +917,8 @@ class BotDatabase:
         Пример:
             >> await db.ban_user(1001)
         """
-        async with self.session_factory() as session:
-            user: Optional[User] = await session.get(User, user_id)
-            if user is None:
-                return
-            user.status = UserStatus.BANNED
-            await session.commit()
+        stmt = update(User).where(User.id == user_id).values(status=UserStatus.BANNED)
+        await self._coalesced_write(lambda session: session.execute(stmt))
 
     async def unban_user(self, user_id: int) -> None:
         """
@@ -573,13 +930,12 @@ class BotDatabase:
         Пример:
             >> await db.unban_user(1001)
         """
-        async with self.session_factory() as session:
-            user: Optional[User] = await session.get(User, user_id)
-            if user is None:
-                return
-            if user.status == UserStatus.BANNED:
-                user.status = UserStatus.ACTIVE
-                await session.commit()
+        stmt = (
+            update(User)
+            .where(User.id == user_id, User.status == UserStatus.BANNED)
+            .values(status=UserStatus.ACTIVE)
+        )
+        await self._coalesced_write(lambda session: session.execute(stmt))
 
     async def get_user(self, user_id: int) -> Optional[User]:
         """
@@ -596,7 +952,7 @@ class BotDatabase:
             >> if user:
             >>     print(user.username)
         """
-        async with self.session_factory() as session:
+        async with self._read_session_factory() as session:
             return await session.get(User, user_id)
 
     async def get_all_users(self, include_banned: bool = False) -> List[User]:
@@ -614,10 +970,10 @@ class BotDatabase:
             >> for user in users:
             >>     print(f"{user.id}: {user.username}")
         """
-        async with self.session_factory() as session:
-            stmt: Select[Tuple[User]] = select(User)
+        async with self._read_session_factory() as session:
+            stmt: StatementLambdaElement = lambda_stmt(lambda: select(User))
             if not include_banned:
-                stmt = stmt.where(User.status != UserStatus.BANNED)
+                stmt += lambda s: s.where(User.status != UserStatus.BANNED)
             res: Result[Tuple[User]] = await session.execute(stmt)
             return list(res.scalars().all())
 
@@ -641,13 +997,16 @@ class BotDatabase:
         Пример:
             >> active_user_ids = await db.get_user_ids(only_active=True, include_admins=False)
         """
-        async with self.session_factory() as session:
-            stmt: Select[Tuple[int]] = select(User.id)
+        async with self._read_session_factory() as session:
+            stmt: StatementLambdaElement = lambda_stmt(lambda: select(User.id))
             if only_active:
-                stmt = stmt.where(User.status != UserStatus.BANNED)
+                stmt += lambda s: s.where(User.status != UserStatus.BANNED)
             if not include_admins:
-                stmt = stmt.where(User.status != UserStatus.ADMIN)
-            stmt = stmt.order_by(User.id.asc() if order_asc else User.id.desc())
+                stmt += lambda s: s.where(User.status != UserStatus.ADMIN)
+            if order_asc:
+                stmt += lambda s: s.order_by(User.id.asc())
+            else:
+                stmt += lambda s: s.order_by(User.id.desc())
 
             res: Result[Tuple[int]] = await session.execute(stmt)
             ids: List[int] = list(res.scalars().all())
@@ -659,38 +1018,159 @@ class BotDatabase:
             user_id: int,
             message_text: str,
             created_at: Optional[datetime] = None,
+            username: Optional[str] = None,
+            full_name: Optional[str] = None,
     ) -> None:
-        async with self.session_factory() as session:
-            # Сначала пытаемся найти пользователя
-            user: Optional[User] = await session.get(User, user_id)
-
-            # Если пользователя нет, создаем его
-            if user is None:
-                user = User(id=user_id, status=UserStatus.ACTIVE)
-                session.add(user)
-                await session.flush()
-
-            # Используем переданную дату или текущее время
-            if created_at is not None:
-                # Убедимся, что дата имеет временную зону
-                if created_at.tzinfo is None:
-                    created_at = created_at.replace(tzinfo=timezone.utc)
-                ts = created_at
+        """
+        Ставит сообщение в очередь на запись; в БД его сохраняет фоновая задача пачкой.
+        Отсутствующий пользователь создаётся при записи.
+
+        Args:
+            user_id: Telegram ID автора.
+            message_text: текст сообщения.
+            created_at: время сообщения (по умолчанию — момент записи, UTC).
+            username: никнейм — используется, если пользователя ещё нет.
+            full_name: полное имя — используется, если пользователя ещё нет.
+
+        Пример:
+            >> await db.add_message(1001, "Привет")
+            >> await db.flush()  # если запись нужна сразу
+        """
+        self._ensure_writer()
+        self._msg_queue.put_nowait((user_id, username, full_name, message_text, created_at))
+
+    async def flush(self) -> None:
+        """
+        Дожидается записи всех сообщений, поставленных в очередь.
+
+        Пример:
+            >> await db.flush()
+        """
+        await self._msg_queue.join()
+
+    def _ensure_writer(self) -> None:
+        """Запускает фоновую запись сообщений, если она ещё не запущена."""
+        if self._writer_task is None:
+            self._writer_task = create_task(self._message_writer())
+
+    async def _message_writer(self) -> None:
+        """
+        Фоновая задача: забирает накопленные сообщения из очереди
+        и сохраняет их одной транзакцией (до MESSAGE_BATCH_SIZE за раз).
+        """
+        while True:
+            batch = [await self._msg_queue.get()]
+            try:
+                while len(batch) < self.MESSAGE_BATCH_SIZE:
+                    batch.append(self._msg_queue.get_nowait())
+            except QueueEmpty:
+                pass
+
+            # Наличие в БД проверяем только у новых авторов или сменивших имя
+            unseen: set[int] = {
+                user_id for user_id, username, full_name, _, _ in batch
+                if self._known_users.get(user_id) != (username, full_name)
+            }
+            try:
+                await self._write_batch(batch, unseen)
+            finally:
+                for _ in batch:
+                    self._msg_queue.task_done()
+            await sleep(self.MESSAGE_FLUSH_INTERVAL)
+
+    async def _write_batch(
+            self,
+            batch: List[Tuple[int, Optional[str], Optional[str], str, Optional[datetime]]],
+            unseen: set[int],
+    ) -> None:
+        """
+        Записывает пачку сообщений, повторяя попытку при ошибке (до MESSAGE_WRITE_RETRIES раз).
+        Пачка пишется одной транзакцией, поэтому неудачная попытка ничего не оставляет в БД.
+        """
+        for attempt in range(1, self.MESSAGE_WRITE_RETRIES + 2):
+            try:
+                await self.add_messages_bulk(batch, check_user_ids=unseen)
+            except Exception:
+                logger.exception(
+                    "Ошибка записи %d сообщений в БД (попытка %d из %d)",
+                    len(batch), attempt, self.MESSAGE_WRITE_RETRIES + 1,
+                )
+                if attempt <= self.MESSAGE_WRITE_RETRIES:
+                    await sleep(self.MESSAGE_FLUSH_INTERVAL * attempt)
             else:
-                ts = datetime.now(timezone.utc)
+                self._remember_users(batch)
+                return
+        logger.error("Потеряно %d сообщений: запись в БД не удалась", len(batch))
+
+    def _remember_users(self, batch: List[Tuple[int, Optional[str], Optional[str], str, Optional[datetime]]]) -> None:
+        """Отмечает авторов записанной пачки как известных, вытесняя самых давних."""
+        for user_id, username, full_name, _, _ in batch:
+            self._known_users[user_id] = (username, full_name)
+            self._known_users.move_to_end(user_id)
+        while len(self._known_users) > self.KNOWN_USERS_MAX:
+            self._known_users.popitem(last=False)
 
-            record: UserMessage = UserMessage(user_id=user_id, message_text=message_text, created_at=ts)
-            session.add(record)
+    async def add_messages_bulk(
+            self,
+            rows: List[Tuple[int, Optional[str], Optional[str], str, Optional[datetime]]],
+            check_user_ids: Optional[set[int]] = None,
+    ) -> None:
+        """
+        Сохраняет пачку сообщений одной транзакцией; недостающих пользователей создаёт.
+
+        Args:
+            rows: кортежи (user_id, username, full_name, message_text, created_at).
+            check_user_ids: ID, наличие которых нужно проверить (по умолчанию — все авторы пачки);
+                остальные авторы считаются уже существующими.
+
+        Пример:
+            >> await db.add_messages_bulk([(42, "neo", "Thomas Anderson", "Привет", None)])
+        """
+        if not rows:
+            return
+
+        now: datetime = _utcnow()
+        async with self.session_factory() as session:
+            # Недостающих авторов создаём одним upsert'ом, существующие не трогаем
+            user_ids = {row[0] for row in rows} if check_user_ids is None else check_user_ids
+            if user_ids:
+                new_users: Dict[int, Dict[str, Any]] = {}
+                for user_id, username, full_name, _, _ in rows:
+                    if user_id in user_ids and user_id not in new_users:
+                        new_users[user_id] = {
+                            "id": user_id,
+                            "username": username,
+                            "full_name": full_name,
+                            "status": UserStatus.ACTIVE,
+                        }
+                await session.execute(_INSERT_MISSING_USERS, list(new_users.values()))
+
+            await session.execute(
+                _INSERT_MESSAGES,
+                [
+                    {
+                        "user_id": user_id,
+                        "message_text": message_text,
+                        "created_at": (
+                            now if created_at is None
+                            else created_at.replace(tzinfo=_UTC) if created_at.tzinfo is None
+                            else created_at
+                        ),
+                    }
+                    for user_id, _, _, message_text, created_at in rows
+                ],
+            )
             await session.commit()
 
     async def check_connection(self) -> bool:
         """Проверяет соединение с базой данных"""
         try:
-            async with self.session_factory() as session:
-                await session.execute(sql_text("SELECT 1"))
+            # Без ORM-сессии: хватает соединения из пула
+            async with self.engine.connect() as conn:
+                await conn.execute(sql_text("SELECT 1"))
             return True
-        except Exception as e:
-            print(f"Ошибка подключения к БД: {e}")
+        except Exception:
+            logger.exception("Ошибка подключения к БД")
             return False
 
     async def add_message_from_message(self, message: SupportsAiogramMessage) -> None:
@@ -703,15 +1183,20 @@ class BotDatabase:
         Пример:
             >> await db.add_message_from_message(message)
         """
-        if not isinstance(message, SupportsAiogramMessage):
-            raise TypeError("message не соответствует протоколу SupportsAiogramMessage")
-        from_user: SupportsUser = message.from_user
-        if not isinstance(from_user, SupportsUser):
-            raise TypeError("message.from_user не соответствует протоколу SupportsUser")
+        try:
+            from_user: SupportsUser = message.from_user
+            user_id: int = from_user.id
+            username: Optional[str] = from_user.username
+            full_name: Optional[str] = from_user.full_name
+            message_text: str = message.text or ""
+        except AttributeError as e:
+            raise TypeError("message не соответствует протоколу SupportsAiogramMessage") from e
 
         await self.add_message(
-            user_id=from_user.id,
-            message_text=message.text or "",
+            user_id=user_id,
+            message_text=message_text,
+            username=username,
+            full_name=full_name,
         )
 
     async def get_message_stats(self, user_id: int) -> Tuple[int, int, int, int]:
@@ -731,24 +1216,19 @@ class BotDatabase:
             >> day, week, month, total = await db.get_message_stats(1001)
             >> print(f"За день: {day}, за неделю: {week}, за месяц: {month}, всего: {total}")
         """
-        async with self.session_factory() as session:
-            now: datetime = datetime.now(timezone.utc)
-            day_start: datetime = _start_of_day(now)
-            week_start: datetime = _start_of_week_monday(now)
-            month_start: datetime = _start_of_month(now)
-            epoch_start: datetime = datetime(1970, 1, 1, tzinfo=timezone.utc)
-
-            async def _count_from(since: datetime) -> int:
-                stmt: Select[Tuple[int]] = select(func.count()).where(
-                    and_(UserMessage.user_id == user_id, UserMessage.created_at >= since)
-                )
-                res: Result[Tuple[int]] = await session.execute(stmt)
-                return int(res.scalar() or 0)
+        async with self._read_session_factory() as session:
+            day_start, week_start, month_start = _period_starts(int(time()) // 60)
 
-            day_count: int = await _count_from(day_start)
-            week_count: int = await _count_from(week_start)
-            month_count: int = await _count_from(month_start)
-            total_count: int = await _count_from(epoch_start)
+            # Все четыре счётчика — одним заранее собранным запросом по индексу (user_id, created_at)
+            row = (await session.execute(
+                _MESSAGE_STATS_STMT,
+                {"uid": user_id, "day": day_start, "week": week_start, "month": month_start},
+            )).one()
+
+            day_count: int = int(row[0] or 0)
+            week_count: int = int(row[1] or 0)
+            month_count: int = int(row[2] or 0)
+            total_count: int = int(row[3] or 0)
 
             return day_count, week_count, month_count, total_count
 
@@ -771,14 +1251,18 @@ class BotDatabase:
         # создаём таблицы перед вставкой ролей
         await self.init_db()
 
+        # Первый регион для каждого имени (повторы во входном списке игнорируются)
+        wanted: Dict[str, RoleRegion] = {}
+        for name, region in roles:
+            wanted.setdefault(name, region)
+
         async with self.session_factory() as session:
-            for name, region in roles:
-                stmt = select(Role).where(Role.name == name)
-                res = await session.execute(stmt)
-                role = res.scalar_one_or_none()
-                if not role:
-                    session.add(Role(name=name, region=region))
+            # Существующие роли — одним запросом, добавляем только недостающие
+            stmt: Select[Tuple[str]] = select(Role.name).where(Role.name.in_(wanted))
+            existing: set[str] = set((await session.scalars(stmt)).all())
+            session.add_all([Role(name=name, region=region) for name, region in wanted.items() if name not in existing])
             await session.commit()
+        self._invalidate_role_status()
 
     async def assign_role(self, role_name: str, user_id: int, bot: Optional[SupportsAiogramBot] = None) -> bool:
         """
@@ -798,24 +1282,21 @@ class BotDatabase:
             >>     print("Роль назначена")
         """
         async with self.session_factory() as session:
-            role_stmt: Select[Tuple[Role]] = select(Role).where(Role.name == role_name)
-            role_res: Result[Tuple[Role]] = await session.execute(role_stmt)
-            role: Optional[Role] = role_res.scalar_one_or_none()
-            if role is None or role.occupied_by is not None:
-                return False
-
-            user: Optional[User] = await session.get(User, user_id)
-            if user is None or user.status == UserStatus.BANNED:
+            # Один условный UPDATE: роль свободна и пользователь существует и не забанен
+            res: Result[Tuple[RoleRegion]] = await session.execute(
+                _ASSIGN_ROLE_STMT, {"role_name": role_name, "uid": user_id}
+            )
+            region: Optional[RoleRegion] = res.scalar_one_or_none()
+            if region is None:
                 return False
 
-            role.occupied_by = user_id
             await session.commit()
+            self._invalidate_role_status()
 
             # Обновляем сообщение с ролями если передан бот
             if bot:
                 # Определяем игру по региону
-                game_type: str = "hsr" if role.region.name.startswith("HSR_") else "genshin"
-                await self.update_role_message(game_type, bot)
+                await self.update_role_message(_game_type(region), bot)
 
             return True
 
@@ -836,24 +1317,66 @@ class BotDatabase:
             >>     print("Роль освобождена")
         """
         async with self.session_factory() as session:
-            stmt: Select[Tuple[Role]] = select(Role).where(Role.name == role_name)
-            res: Result[Tuple[Role]] = await session.execute(stmt)
-            role: Optional[Role] = res.scalar_one_or_none()
-
-            if role is None or role.occupied_by is None:
+            # Один условный UPDATE: освобождаем, только если роль занята
+            res: Result[Tuple[RoleRegion]] = await session.execute(_RELEASE_ROLE_STMT, {"role_name": role_name})
+            region: Optional[RoleRegion] = res.scalar_one_or_none()
+            if region is None:
                 return False
 
-            role.occupied_by = None
             await session.commit()
+            self._invalidate_role_status()
 
             # Обновляем сообщение с ролями если передан бот
             if bot:
                 # Определяем игру по региону
-                game_type: str = "hsr" if role.region.name.startswith("HSR_") else "genshin"
-                await self.update_role_message(game_type, bot)
+                await self.update_role_message(_game_type(region), bot)
 
             return True
 
+    async def release_roles(self, names: Iterable[str], bot: Optional[SupportsAiogramBot] = None) -> int:
+        """
+        Освобождает несколько ролей одним запросом.
+
+        Args:
+            names: названия ролей.
+            bot: экземпляр бота для обновления сообщений (опционально).
+
+        Returns:
+            int: количество освобождённых ролей (свободные и несуществующие не считаются).
+
+        Пример:
+            >> count = await db.release_roles(("Альбедо", "Нахида"), bot)
+            >> print(f"Освобождено {count} ролей")
+        """
+        names = list(names)
+        if not names:
+            return 0
+
+        async with self.session_factory() as session:
+            # Один UPDATE ... WHERE name IN (...) вместо запроса на каждую роль
+            stmt = (
+                update(Role)
+                .where(Role.name.in_(names), Role.occupied_by.is_not(None))
+                .values(occupied_by=None)
+                .returning(Role.region)
+            )
+            res: Result[Tuple[RoleRegion]] = await session.execute(stmt)
+            regions: List[RoleRegion] = list(res.scalars().all())
+
+            if regions:
+                await session.commit()
+                self._invalidate_role_status()
+
+                # Обновляем сообщения только затронутых игр, параллельно
+                if bot:
+                    game_types: set[str] = {_game_type(r) for r in regions}
+                    await gather(
+                        *(self.update_role_message(game_type, bot) for game_type in game_types),
+                        return_exceptions=True,
+                    )
+
+            return len(regions)
+
     async def get_role_status(self) -> List[Tuple[str, Optional[int]]]:
         """
         Возвращает текущий статус всех ролей.
@@ -867,11 +1390,23 @@ class BotDatabase:
             >>     status = "занята" if user_id else "свободна"
             >>     print(f"{name}: {status}")
         """
-        async with self.session_factory() as session:
-            stmt: Select[Tuple[Role]] = select(Role).order_by(Role.name.asc())
-            res: Result[Tuple[Role]] = await session.execute(stmt)
-            roles: List[Role] = list(res.scalars().all())
-            return [(r.name, r.occupied_by) for r in roles]
+        status: Optional[Dict[str, Optional[int]]] = self._role_status_cache
+        if status is None:
+            generation: int = self._role_status_gen
+            async with self._read_session_factory() as session:
+                # Только нужные столбцы — без создания ORM-объектов и identity map
+                stmt: Select[Tuple[str, Optional[int]]] = select(Role.name, Role.occupied_by).order_by(Role.name.asc())
+                res: Result[Tuple[str, Optional[int]]] = await session.execute(stmt)
+                status = dict(res.tuples().all())
+            # Роли могли измениться, пока шло чтение, — тогда результат в кэш не кладём
+            if generation == self._role_status_gen:
+                self._role_status_cache = status
+        return list(status.items())
+
+    def _invalidate_role_status(self) -> None:
+        """Сбрасывает кэш статуса ролей после их изменения."""
+        self._role_status_gen += 1
+        self._role_status_cache = None
 
     async def get_roles_by_user(self, user_id: int) -> List[str]:
         """
@@ -887,7 +1422,7 @@ class BotDatabase:
             >> roles = await db.get_roles_by_user(1001)
             >> print(f"Пользователь занимает роли: {', '.join(roles)}")
         """
-        async with self.session_factory() as session:
+        async with self._read_session_factory() as session:
             stmt: Select[Tuple[str]] = select(Role.name).where(Role.occupied_by == user_id)
             res: Result[Tuple[str]] = await session.execute(stmt)
             names: List[str] = list(res.scalars().all())
@@ -909,23 +1444,30 @@ class BotDatabase:
             >> print(f"Освобождено {count} ролей")
         """
         async with self.session_factory() as session:
-            stmt: Select[Tuple[Role]] = select(Role).where(Role.occupied_by == user_id)
-            res: Result[Tuple[Role]] = await session.execute(stmt)
-            roles: List[Role] = list(res.scalars().all())
-
-            for r in roles:
-                r.occupied_by = None
+            # Один UPDATE ... RETURNING: регионы освобождённых ролей без загрузки объектов
+            stmt = (
+                update(Role)
+                .where(Role.occupied_by == user_id)
+                .values(occupied_by=None)
+                .returning(Role.region)
+            )
+            res: Result[Tuple[RoleRegion]] = await session.execute(stmt)
+            regions: List[RoleRegion] = list(res.scalars().all())
 
-            if roles:
+            if regions:
                 await session.commit()
+                self._invalidate_role_status()
 
-                # Обновляем сообщения с ролями если передан бот
+                # Обновляем сообщения только тех игр, в которых пользователь занимал роли
                 if bot:
-                    # Обновляем оба типа сообщений, так как пользователь мог занимать роли в обеих играх
-                    await self.update_role_message("genshin", bot)
-                    await self.update_role_message("hsr", bot)
+                    game_types: set[str] = {_game_type(r) for r in regions}
+                    # Сообщения разных игр независимы — редактируем их параллельно
+                    await gather(
+                        *(self.update_role_message(game_type, bot) for game_type in game_types),
+                        return_exceptions=True,
+                    )
 
-            return len(roles)
+            return len(regions)
 
     async def get_available_roles(self, region: Optional[RoleRegion] = None) -> List[Role]:
         """
@@ -942,7 +1484,7 @@ class BotDatabase:
             >> for role in free_roles:
             >>     print(role.name)
         """
-        async with self.session_factory() as session:
+        async with self._read_session_factory() as session:
             stmt: Select[Tuple[Role]] = select(Role).where(Role.occupied_by.is_(None))
             if region:
                 stmt = stmt.where(Role.region == region)
@@ -966,7 +1508,7 @@ class BotDatabase:
             >> for role in occupied_roles:
             >>     print(f"{role.name} занята пользователем {role.occupied_by}")
         """
-        async with self.session_factory() as session:
+        async with self._read_session_factory() as session:
             stmt: Select[Tuple[Role]] = select(Role).where(Role.occupied_by.is_not(None))
             if region:
                 stmt = stmt.where(Role.region == region)
@@ -990,9 +1532,8 @@ class BotDatabase:
             >> if role:
             >>     print(f"Регион: {role.region}, занята: {role.occupied_by is not None}")
         """
-        async with self.session_factory() as session:
-            stmt: Select[Tuple[Role]] = select(Role).where(Role.name == role_name)
-            res: Result[Tuple[Role]] = await session.execute(stmt)
+        async with self._read_session_factory() as session:
+            res: Result[Tuple[Role]] = await session.execute(_role_by_name_stmt(role_name))
             return res.scalar_one_or_none()
 
     async def get_roles_by_region(self, region: RoleRegion) -> List[Role]:
@@ -1011,7 +1552,7 @@ class BotDatabase:
             >>     status = "занята" if role.occupied_by else "свободна"
             >>     print(f"{role.name}: {status}")
         """
-        async with self.session_factory() as session:
+        async with self._read_session_factory() as session:
             stmt: Select[Tuple[Role]] = select(Role).where(Role.region == region).order_by(Role.name.asc())
             res: Result[Tuple[Role]] = await session.execute(stmt)
             return list(res.scalars().all())
@@ -1020,7 +1561,7 @@ class BotDatabase:
         """
         Возвращает статистику по регионам: количество свободных и занятых ролей.
         """
-        async with self.session_factory() as session:
+        async with self._read_session_factory() as session:
             # Используем агрегатные функции для подсчета статистики
             stmt = select(
                 Role.region,
@@ -1067,24 +1608,21 @@ class BotDatabase:
             >>     message_text="Список персонажей Genshin Impact"
             >> )
         """
+        # Одна запись на игру: атомарный INSERT ... ON CONFLICT DO UPDATE
+        values: Dict[str, Any] = {
+            "channel_id": channel_id,
+            "message_id": message_id,
+            "message_text": message_text,
+        }
+        stmt = sqlite_insert(RoleMessage).values(game_type=game_type, **values).on_conflict_do_update(
+            index_elements=[RoleMessage.game_type],
+            set_=values,
+        )
+
         async with self.session_factory() as session:
-            # Удаляем старую запись если есть
-            stmt = select(RoleMessage).where(RoleMessage.game_type == game_type)
-            result = await session.execute(stmt)
-            existing = result.scalar_one_or_none()
-
-            if existing:
-                await session.delete(existing)
-
-            # Создаем новую запись
-            new_message = RoleMessage(
-                game_type=game_type,
-                channel_id=channel_id,
-                message_id=message_id,
-                message_text=message_text
-            )
-            session.add(new_message)
+            await session.execute(stmt)
             await session.commit()
+        self._role_msg_cache[game_type] = (channel_id, message_id, message_text)
 
     async def update_role_message(self, game_type: str, bot: SupportsAiogramBot) -> bool:
         """
@@ -1102,58 +1640,40 @@ class BotDatabase:
             >> if success:
             >>     print("Сообщение обновлено")
         """
-        async with self.session_factory() as session:
-            # Получаем информацию о сообщении
-            stmt = select(RoleMessage).where(RoleMessage.game_type == game_type)
-            result = await session.execute(stmt)
-            role_message = result.scalar_one_or_none()
-
-            if not role_message:
+        # Сообщение меняется только через save_role_message — берём его из кэша
+        cached: Optional[Tuple[int, int, str]] = self._role_msg_cache.get(game_type)
+        if cached is None:
+            async with self._read_session_factory() as session:
+                # Получаем информацию о сообщении
+                stmt = select(
+                    RoleMessage.channel_id, RoleMessage.message_id, RoleMessage.message_text
+                ).where(RoleMessage.game_type == game_type)
+                row = (await session.execute(stmt)).one_or_none()
+
+            if row is None:
                 return False
+            cached = self._role_msg_cache[game_type] = (row[0], row[1], row[2])
 
-            # Получаем статус всех ролей
-            roles_status = await self.get_role_status()
-            role_status_dict = {name: user_id for name, user_id in roles_status}
+        channel_id, message_id, message_text = cached
 
-            # Обновляем текст сообщения
-            lines = role_message.message_text.split('\n')
-            updated_lines = []
+        # Получаем статус всех ролей
+        roles_status = await self.get_role_status()
+        role_status_dict = {name: user_id for name, user_id in roles_status}
 
-            for line in lines:
-                # Пропускаем заголовки и пустые строки
-                if not line.strip() or any(marker in line for marker in ['ᵎ', 'СПИСОК', 'Если персонажа']):
-                    updated_lines.append(line)
-                    continue
+        # Обновляем текст сообщения одним проходом по строкам
+        updated_text: str = _rewrite_role_text(message_text, role_status_dict)
 
-                # Проверяем, есть ли роль в этом сообщении
-                role_name = line.strip().replace('✅', '').replace('🕒', '').strip()
-
-                if role_name in role_status_dict:
-                    if role_status_dict[role_name] is not None:
-                        # Роль занята - добавляем галочку
-                        updated_line = f"{role_name} ✅"
-                    else:
-                        # Роль свободна - оставляем как есть
-                        updated_line = role_name
-                else:
-                    # Роль не найдена в базе - оставляем как есть
-                    updated_line = line
-
-                updated_lines.append(updated_line)
-
-            updated_text = '\n'.join(updated_lines)
-
-            # Обновляем сообщение в Telegram
-            try:
-                await bot.edit_message_text(
-                    chat_id=role_message.channel_id,
-                    message_id=role_message.message_id,
-                    text=updated_text
-                )
-                return True
-            except Exception as e:
-                print(f"Ошибка при обновлении сообщения: {e}")
-                return False
+        # Обновляем сообщение в Telegram
+        try:
+            await bot.edit_message_text(
+                chat_id=channel_id,
+                message_id=message_id,
+                text=updated_text
+            )
+            return True
+        except Exception as e:
+            print(f"Ошибка при обновлении сообщения: {e}")
+            return False
 
     async def init_default_roles(self) -> None:
         """
@@ -1,4 +1,8 @@
-from asyncio import run
+try:
+    # uvloop — более быстрый цикл событий (в зависимостях для всех ОС, кроме Windows)
+    from uvloop import run
+except ImportError:
+    from asyncio import run
 
 from configs import Webhook
 from database import db
@@ -15,13 +19,14 @@ async def main() -> None:
         # Логирование
         setup_logging()
 
-        # Cоздание базы данных
-        await db.init_db()
-        # Проверка соединения
-        if not await db.check_connection():
+        # Проверка соединения, создание базы данных и стандартных ролей
+        if not await db.startup():
             print("Не удалось подключиться к БД!")
             return
-        await db.init_default_roles()
+
+        # Подключение маршрутов (роутеров) до настройки вебхука,
+        # чтобы allowed_updates вычислялись по реальным хендлерам
+        dp.include_router(router)
 
         # Настройка информации о боте
         await BotInfo.setup(bots=bot)
@@ -33,24 +38,29 @@ async def main() -> None:
             channel_ids=[]  # пустой список каналов (можно добавить потом)
         )
 
-        # Подключение маршрутов (роутеров)
-        dp.include_router(router)
-
         # Выбор режима работы: webhook или polling
         if Webhook.WEBHOOK:
             loggers.info(f"Запуск бота @{BotInfo.username} в режиме webhook...")
-            BotInfo.start_info_out()
+            await BotInfo.start_info_out()
             await server.serve()
 
         else:
             loggers.info(f"Бот @{BotInfo.username} запущен в режиме polling...")
-            BotInfo.start_info_out()
-            await dp.start_polling(bot)
+            await BotInfo.start_info_out()
+            # Запрашиваем только те типы апдейтов, которые реально обрабатываются
+            await dp.start_polling(
+                bot,
+                allowed_updates=Webhook.ALLOWED_UPDATES or dp.resolve_used_update_types(),
+            )
 
     except Exception as e:
         loggers.error(f"🔥 Критическая ошибка при запуске: {e}")
         raise
 
+    finally:
+        # Дописываем очередь сообщений и закрываем соединения с БД
+        await db.dispose()
+
 
 if __name__ == "__main__":
     run(main())
@@ -2,7 +2,7 @@ from sys import stderr
 from pathlib import Path
 from functools import wraps
 from inspect import iscoroutinefunction
-from typing import Any, Callable, Optional, TypeVar, cast, Final
+from typing import Any, Callable, Optional, TypeVar, Union, cast, Final
 
 from loguru import logger
 from aiogram.types import Message, User
@@ -116,26 +116,36 @@ class Logger:
     def log_entry(
             self,
             level: str,
-            text: str,
+            text: Union[str, Callable[[], str]],
             log_type: str,
             user: Optional[str] = None,
-            message: Optional[Message] = None
+            message: Optional[Message] = None,
+            args: tuple[Any, ...] = ()
     ) -> None:
         """
         Основной метод для записи логов.
+        Форматирование откладывается до момента, когда запись действительно выводится:
+        аргументы подставляются в плейсхолдеры {} (формат loguru), а callable вызывается лениво.
 
         :param level: Уровень логирования (например, 'INFO')
-        :param text: Сообщение для логирования
+        :param text: Сообщение (или шаблон с {}), либо функция, возвращающая сообщение
         :param log_type: Кастомный тип лога (например, 'HANDLER')
         :param user: Явно указанный пользователь
         :param message: Объект Message для извлечения юзера
+        :param args: Аргументы для подстановки в шаблон text
         """
         actual_user: str = user or self.format_user(message)
-        logger.bind(
+        bound = logger.bind(
             system=self.system_name,
             user=actual_user,
             log_type=log_type
-        ).log(level, text)
+        )
+        if callable(text):
+            bound.opt(lazy=True).log(level, "{}", text)
+        elif args:
+            bound.log(level, text, *args)
+        else:
+            bound.log(level, text)
 
     def log(
             self,
@@ -204,26 +214,26 @@ class Logger:
         """
         return next((arg for arg in args if isinstance(arg, Message)), None)
 
-    # Методы для прямого вызова
-    def debug(self, text: str, log_type: str = 'BOT', user: Optional[str] = None,
-              message: Optional[Message] = None) -> None:
-        self.log_entry('DEBUG', text, log_type, user, message)
+    # Методы для прямого вызова (дополнительные позиционные аргументы — для шаблона text)
+    def debug(self, text: Union[str, Callable[[], str]], *args: Any, log_type: str = 'BOT',
+              user: Optional[str] = None, message: Optional[Message] = None) -> None:
+        self.log_entry('DEBUG', text, log_type, user, message, args)
 
-    def info(self, text: str, log_type: str = 'BOT', user: Optional[str] = None,
-             message: Optional[Message] = None) -> None:
-        self.log_entry('INFO', text, log_type, user, message)
+    def info(self, text: Union[str, Callable[[], str]], *args: Any, log_type: str = 'BOT',
+             user: Optional[str] = None, message: Optional[Message] = None) -> None:
+        self.log_entry('INFO', text, log_type, user, message, args)
 
-    def warning(self, text: str, log_type: str = 'BOT', user: Optional[str] = None,
-                message: Optional[Message] = None) -> None:
-        self.log_entry('WARNING', text, log_type, user, message)
+    def warning(self, text: Union[str, Callable[[], str]], *args: Any, log_type: str = 'BOT',
+                user: Optional[str] = None, message: Optional[Message] = None) -> None:
+        self.log_entry('WARNING', text, log_type, user, message, args)
 
-    def error(self, text: str, log_type: str = 'BOT', user: Optional[str] = None,
-              message: Optional[Message] = None) -> None:
-        self.log_entry('ERROR', text, log_type, user, message)
+    def error(self, text: Union[str, Callable[[], str]], *args: Any, log_type: str = 'BOT',
+              user: Optional[str] = None, message: Optional[Message] = None) -> None:
+        self.log_entry('ERROR', text, log_type, user, message, args)
 
-    def critical(self, text: str, log_type: str = 'BOT', user: Optional[str] = None,
-                 message: Optional[Message] = None) -> None:
-        self.log_entry('CRITICAL', text, log_type, user, message)
+    def critical(self, text: Union[str, Callable[[], str]], *args: Any, log_type: str = 'BOT',
+                 user: Optional[str] = None, message: Optional[Message] = None) -> None:
+        self.log_entry('CRITICAL', text, log_type, user, message, args)
 
 
 # Создаем глобальный экземпляр логгера
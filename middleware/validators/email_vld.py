@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Optional
 
 from email_validator import validate_email, EmailNotValidError, ValidatedEmail
@@ -6,16 +7,19 @@ from email_validator import validate_email, EmailNotValidError, ValidatedEmail
 __all__ = ("valid_email",)
 
 
+@lru_cache(maxsize=4096)
 def valid_email(e_mail: str) -> Optional[str]:
     """
     Валидация почты через библиотеку.
 
     :param e_mail: Получаемая почта.
     :return: Нормализированная почта.
+
+    Проверяется только синтаксис (без DNS-запросов), поэтому результат кэшируется по строке.
     """
     try:
         # Провека почты на валидность
-        email: ValidatedEmail = validate_email(e_mail)
+        email: ValidatedEmail = validate_email(e_mail, check_deliverability=False)
 
     except EmailNotValidError:
         return None
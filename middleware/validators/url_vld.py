@@ -1,23 +1,46 @@
-from re import Pattern, compile
+from html import escape
+from string import ascii_letters, digits
 
 # Настройка экспорта
 __all__ = ("valid_url", "url_to_text",)
 
+# Допустимые символы частей домена и пути (проверка за один линейный проход, без regex-откатов)
+_LABEL_CHARS: frozenset[str] = frozenset(ascii_letters + digits + "-")
+_PATH_CHARS: frozenset[str] = frozenset(ascii_letters + digits + "-@:%_+.~#?&/=")
+# Шаблон жирной HTML-ссылки: (url, текст)
+_LINK_TEMPLATE: str = '<b><a href="{}">{}</a></b>'
+
 
 def valid_url(url: str) -> bool:
     """
     Проверяет, является ли строка валидной ссылкой (URL).
 
+    Формат: [http(s)://]домен.зона[:порт][/путь], где зона — не короче двух латинских букв.
+
     :param url: Строка для проверки.
     :return: True, если строка является валидным URL, иначе False.
     """
-    url_pattern: Pattern[str] = compile(
-        r'^(https?://)?'  # Протокол (http или https, необязателен)
-        r'([a-zA-Z0-9-]+\.)+[a-zA-Z]{2,}'  # Домен
-        r'(:\d+)?'  # Порт (необязателен)
-        r'(/[-a-zA-Z0-9@:%_+.~#?&/=]*)?$'  # Путь, параметры и фрагменты
-    )
-    return bool(url_pattern.match(url))
+    # Протокол (http или https, необязателен)
+    if url.startswith("https://"):
+        url = url[8:]
+    elif url.startswith("http://"):
+        url = url[7:]
+
+    # Путь, параметры и фрагменты
+    host, slash, path = url.partition("/")
+    if slash and not _PATH_CHARS.issuperset(path):
+        return False
+
+    # Порт (необязателен)
+    host, colon, port = host.partition(":")
+    if colon and not (port.isascii() and port.isdigit()):
+        return False
+
+    # Домен: минимум одна часть перед зоной, зона — только буквы
+    *labels, zone = host.split(".")
+    if not labels or len(zone) < 2 or not (zone.isascii() and zone.isalpha()):
+        return False
+    return all(label and _LABEL_CHARS.issuperset(label) for label in labels)
 
 
 def url_to_text(text: str, url: str) -> str:
@@ -26,17 +49,13 @@ def url_to_text(text: str, url: str) -> str:
 
     Эта функция генерирует HTML-ссылку с переданным текстом и URL, используя тег `<а>`, и делает ссылку жирной.
 
-    :param text: Текст, который будет отображаться для ссылки.
+    :param text: Текст, который будет отображаться для ссылки (экранируется).
     :param url: URL, который будет привязан к тексту.
     :return: Строка с HTML кодом для ссылки, если URL валиден.
     :raises ValueError: Если URL невалиден.
     """
-    try:
-        if not valid_url(url):  # Проверяем, является ли URL валидным
-            raise ValueError(f"Переданный URL '{url}' невалиден.")
-
-        # Генерация HTML-ссылки
-        return f'<b><a href="{url}">{text}</a></b>'
+    if not valid_url(url):  # Проверяем, является ли URL валидным
+        raise ValueError(f"Переданный URL '{url}' невалиден.")
 
-    except ValueError as e:
-        raise e  # Перебрасываем ошибку выше для дальнейшей обработки или уведомления
+    # Генерация HTML-ссылки; экранирование не даёт тексту или & в URL сломать разметку Telegram
+    return _LINK_TEMPLATE.format(escape(url), escape(text))